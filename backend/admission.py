@@ -0,0 +1,145 @@
+"""Admission control: per-client token buckets plus a bounded global wait queue"""
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; retry_after is in seconds"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Refill; returns 0 when a token is available, else seconds until one is"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> float:
+        """Consume a token; returns 0 on success, else seconds until one is available"""
+        wait = self.wait_time()
+        if wait == 0:
+            self.tokens -= 1
+        return wait
+
+
+class AdmissionController:
+    """Bounds concurrent work, the number of waiters and how long they wait.
+
+    Rate limits apply per client and per network address. The address bucket
+    allows clients_per_address clients' worth of traffic, so rotating client
+    ids from one address cannot get around the limit.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 16,
+        max_wait: float = 2.0,
+        client_rate: float = 0.5,
+        client_burst: float = 5,
+        clients_per_address: float = 4,
+        max_clients: int = 10000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.clients_per_address = clients_per_address
+        self.max_clients = max_clients
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.counters = {
+            "admitted": 0,
+            "rejected_rate_limited": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+        }
+
+    def _bucket(self, client_id: str, scale: float = 1) -> TokenBucket:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.client_rate * scale, self.client_burst * scale)
+            self._buckets[client_id] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+        return bucket
+
+    def admit(self, client_id: str, address: Optional[str] = None):
+        """Per-client (and per-address) rate check for one request; raises AdmissionRejected.
+
+        A token is taken from every bucket only when all of them have one.
+        """
+        buckets = [self._bucket(f"client:{client_id}")]
+        if address is not None:
+            buckets.append(self._bucket(f"address:{address}", self.clients_per_address))
+        wait = max(bucket.wait_time() for bucket in buckets)
+        if wait > 0:
+            self.counters["rejected_rate_limited"] += 1
+            raise AdmissionRejected("rate_limited", wait)
+        for bucket in buckets:
+            bucket.take()
+
+    @asynccontextmanager
+    async def capacity(self):
+        """One unit of global concurrency (one upstream call), with bounded queueing"""
+        if not self._semaphore.locked():
+            # Free slot: acquire returns without suspending
+            await self._semaphore.acquire()
+        elif self.queue_depth >= self.max_queue:
+            self.counters["rejected_queue_full"] += 1
+            raise AdmissionRejected("queue_full", self.max_wait)
+        else:
+            self.queue_depth += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.counters["rejected_timeout"] += 1
+                raise AdmissionRejected("timeout", self.max_wait)
+            finally:
+                self.queue_depth -= 1
+
+        self.counters["admitted"] += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self, client_id: str):
+        """Rate check plus one unit of capacity"""
+        self.admit(client_id)
+        async with self.capacity():
+            yield
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait,
+            "tracked_clients": len(self._buckets),
+            **self.counters,
+        }
@@ -0,0 +1,314 @@
+"""Columnar in-memory snapshot of applications plus incrementally maintained status-history analytics"""
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Optional, List
+
+import numpy as np
+
+# Funnel stages in order; Rejected is terminal and only counts as having applied
+FUNNEL_STAGES = ["Applied", "In Progress", "Interview", "Offer"]
+STATUSES = FUNNEL_STAGES + ["Rejected"]
+SUCCESS_STATUSES = ("Interview", "Offer")
+# History marker written when an application is deleted; its events are excluded
+DELETED_STATUS = "Deleted"
+PERCENTILES = [25, 50, 75, 90]
+
+_DAY = 86400.0
+
+
+def to_days(value: Optional[str]) -> float:
+    """ISO date/datetime string -> days since epoch (NaN when missing or unparseable)"""
+    if not value:
+        return np.nan
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return np.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp() / _DAY
+
+
+class ApplicationSnapshot:
+    """Struct-of-arrays copy of current status and platform per application.
+
+    Writes update a single row in place (deletes swap the last row in), so
+    the snapshot never has to be rebuilt after the initial load.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._status_codes = {s: i for i, s in enumerate(STATUSES)}
+        self.platforms: List[str] = []
+        self._platform_codes: Dict[str, int] = {}
+        self.loaded = False
+        self.version = 0
+        self._cache = None  # (version, result)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.status = np.zeros(capacity, dtype=np.int16)
+        self.platform = np.zeros(capacity, dtype=np.int16)
+
+    def _grow(self):
+        size = len(self.status)
+        old = (self.status, self.platform)
+        self._allocate(size * 2)
+        for new, prev in zip((self.status, self.platform), old):
+            new[:size] = prev
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    def _code(self, status: Optional[str]) -> int:
+        # Unknown statuses are counted as plain Applied
+        return self._status_codes.get(status or "Applied", 0)
+
+    def _platform_code(self, platform: Optional[str]) -> int:
+        platform = platform or "Other"
+        if platform not in self._platform_codes:
+            self._platform_codes[platform] = len(self.platforms)
+            self.platforms.append(platform)
+        return self._platform_codes[platform]
+
+    def _write(self, row: int, doc: dict):
+        self.status[row] = self._code(doc.get("status"))
+        self.platform[row] = self._platform_code(doc.get("platform"))
+
+    def load(self, docs: Iterable[dict]):
+        with self._lock:
+            self._ids, self._row = [], {}
+            self._allocate(1024)
+            for doc in docs:
+                self._upsert(doc)
+            self.loaded = True
+            self.version += 1
+
+    def _upsert(self, doc: dict):
+        self.version += 1
+        app_id = str(doc["_id"])
+        row = self._row.get(app_id)
+        if row is None:
+            row = len(self._ids)
+            if row >= len(self.status):
+                self._grow()
+            self._ids.append(app_id)
+            self._row[app_id] = row
+        self._write(row, doc)
+
+    def upsert(self, doc: dict):
+        with self._lock:
+            self._upsert(doc)
+
+    def remove(self, app_id: str):
+        with self._lock:
+            row = self._row.pop(str(app_id), None)
+            if row is None:
+                return
+            self.version += 1
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                for column in (self.status, self.platform):
+                    column[row] = column[last]
+                self._ids[row] = moved
+                self._row[moved] = row
+            self._ids.pop()
+
+    def compute(self) -> Dict[str, Any]:
+        """Current status counts and per-platform conversion (reused until the next write).
+
+        The funnel and time-in-status come from the status history; see
+        history_analytics.
+        """
+        cache = self._cache
+        if cache and cache[0] == self.version:
+            return cache[1]
+
+        with self._lock:
+            version = self.version
+            n = self.size
+            status = self.status[:n].copy()
+            platform = self.platform[:n].copy()
+            platforms = list(self.platforms)
+
+        status_counts = np.bincount(status, minlength=len(STATUSES))
+
+        # Per-platform conversion to Interview/Offer
+        success = np.isin(status, [self._status_codes[s] for s in SUCCESS_STATUSES])
+        totals = np.bincount(platform, minlength=len(platforms))
+        wins = np.bincount(platform, weights=success, minlength=len(platforms))
+        rates = np.divide(wins, totals, out=np.zeros(len(platforms)), where=totals > 0)
+        platform_conversion = {
+            name: {"total": int(totals[i]), "interview_or_offer": int(wins[i]), "rate": round(float(rates[i]), 4)}
+            for i, name in enumerate(platforms) if totals[i]
+        }
+
+        result = {
+            "total": n,
+            "status_counts": {s: int(status_counts[i]) for i, s in enumerate(STATUSES)},
+            "platform_conversion": platform_conversion,
+        }
+        self._cache = (version, result)
+        return result
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {f"p{p}": None for p in PERCENTILES}
+    result = np.percentile(np.clip(values, 0, None), PERCENTILES)
+    return {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, result)}
+
+
+class StatusHistory:
+    """Per-status entry/exit aggregates, kept up to date from status history events.
+
+    Each application has a row with its current status, when it entered it,
+    its furthest funnel rank and whether it was deleted. Every time an
+    application leaves a status, the time spent there is appended to a
+    column of closed durations. record() is O(events written), and compute()
+    is vectorized over these arrays, so the history collection is only read
+    once (load).
+
+    Events for one application must arrive in time order; load() sorts.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._status_codes = {s: i for i, s in enumerate(STATUSES)}
+        self._row: Dict[str, int] = {}
+        self._closed = 0
+        self.loaded = False
+        self._allocate_apps(capacity)
+        self._allocate_closed(capacity)
+
+    def _allocate_apps(self, capacity: int):
+        self.current = np.full(capacity, -1, dtype=np.int16)   # -1: no status yet
+        self.since = np.full(capacity, np.nan)
+        self.furthest = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.ones(capacity, dtype=bool)
+
+    def _allocate_closed(self, capacity: int):
+        self.closed_row = np.zeros(capacity, dtype=np.int32)
+        self.closed_status = np.zeros(capacity, dtype=np.int16)
+        self.closed_days = np.zeros(capacity)
+
+    @staticmethod
+    def _grown(column: np.ndarray, fill) -> np.ndarray:
+        grown = np.full(len(column) * 2, fill, dtype=column.dtype)
+        grown[:len(column)] = column
+        return grown
+
+    def _app(self, app_id: str) -> int:
+        row = self._row.get(app_id)
+        if row is None:
+            row = len(self._row)
+            if row >= len(self.current):
+                self.current = self._grown(self.current, -1)
+                self.since = self._grown(self.since, np.nan)
+                self.furthest = self._grown(self.furthest, 0)
+                self.alive = self._grown(self.alive, True)
+            self._row[app_id] = row
+        return row
+
+    def _add(self, app_id: str, to_status: Optional[str], at: float):
+        row = self._app(app_id)
+        if to_status == DELETED_STATUS:
+            self.alive[row] = False
+            return
+        code = self._status_codes.get(to_status, 0)
+        if self.current[row] >= 0:
+            if self._closed >= len(self.closed_row):
+                self.closed_row = self._grown(self.closed_row, 0)
+                self.closed_status = self._grown(self.closed_status, 0)
+                self.closed_days = self._grown(self.closed_days, 0.0)
+            i = self._closed
+            self.closed_row[i], self.closed_status[i] = row, self.current[row]
+            self.closed_days[i] = at - self.since[row]
+            self._closed += 1
+        self.current[row], self.since[row] = code, at
+        # Rejected ranks as Applied: the furthest stage reached before it still counts
+        rank = 0 if code == self._status_codes["Rejected"] else code
+        self.furthest[row] = max(self.furthest[row], rank)
+
+    def load(self, events: Iterable[dict]):
+        """Rebuild from every history event ({application_id, to_status, at})"""
+        rows = sorted(
+            ((str(e["application_id"]), to_days(e.get("at")), e.get("to_status")) for e in events),
+            key=lambda r: (r[0], r[1])
+        )
+        with self._lock:
+            self._row, self._closed = {}, 0
+            self._allocate_apps(1024)
+            self._allocate_closed(1024)
+            for app_id, at, to_status in rows:
+                self._add(app_id, to_status, at)
+            self.loaded = True
+
+    def record(self, events: Iterable[dict]):
+        """Apply newly written events"""
+        with self._lock:
+            for e in events:
+                self._add(str(e["application_id"]), e.get("to_status"), to_days(e.get("at")))
+
+    def compute(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Funnel and time-in-status over the applications that were not deleted.
+
+        Each status lasts until the application's next event (or now for its
+        current status). Funnel stages count applications whose furthest
+        status reached the stage, so Interview -> Rejected still counts as an
+        interview.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc).timestamp() / _DAY
+        with self._lock:
+            n_apps, n_closed = len(self._row), self._closed
+            current = self.current[:n_apps].copy()
+            since = self.since[:n_apps].copy()
+            furthest = self.furthest[:n_apps].copy()
+            alive = self.alive[:n_apps] & (current >= 0)
+            closed_keep = alive[self.closed_row[:n_closed]]
+            closed_status = self.closed_status[:n_closed][closed_keep]
+            closed_days = self.closed_days[:n_closed][closed_keep]
+
+        n = int(alive.sum())
+        if not n:
+            return {"applications": 0, "events": 0, "funnel": [], "time_in_status": {}}
+
+        status = np.concatenate([closed_status, current[alive]])
+        durations = np.concatenate([closed_days, now - since[alive]])
+
+        time_in_status = {}
+        for code, name in enumerate(STATUSES):
+            mask = status == code
+            if mask.any():
+                time_in_status[name] = {
+                    "transitions": int(mask.sum()),
+                    "days_in_status": _percentiles(durations[mask]),
+                }
+
+        # Applications reaching at least stage i: reverse cumulative count of furthest ranks
+        per_rank = np.bincount(furthest[alive], minlength=len(FUNNEL_STAGES))[:len(FUNNEL_STAGES)]
+        reached = np.cumsum(per_rank[::-1])[::-1]
+        funnel = []
+        for i, stage in enumerate(FUNNEL_STAGES):
+            previous = reached[i - 1] if i else n
+            funnel.append({
+                "stage": stage,
+                "reached": int(reached[i]),
+                "conversion_from_start": round(float(reached[i]) / n, 4),
+                "conversion_from_previous": round(float(reached[i]) / float(previous), 4) if previous else 0.0,
+            })
+
+        return {"applications": n, "events": len(status), "funnel": funnel, "time_in_status": time_in_status}
+
+
+def history_analytics(events: Iterable[dict], now: Optional[float] = None) -> Dict[str, Any]:
+    """Funnel and time-in-status computed once from a list of history events (see StatusHistory)"""
+    history = StatusHistory()
+    history.load(events)
+    return history.compute(now)
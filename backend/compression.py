@@ -0,0 +1,123 @@
+"""Compression middleware for JSON responses (brotli when available, gzip otherwise)"""
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip covers every client
+    brotli = None
+
+
+class JSONCompressionMiddleware:
+    """Compress JSON bodies above minimum_size.
+
+    Only application/json responses are buffered and compressed, so file
+    downloads and streaming responses pass through untouched. A strong ETag
+    on a compressed body gets the coding appended ("<tag>-gzip"), since the
+    bytes differ from the identity body. The suffix is stripped from an
+    incoming If-None-Match before the app sees it, and put back on a 304.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, accept_encoding: str):
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    @staticmethod
+    def _strip_codings(if_none_match: str):
+        """If-None-Match with our coding suffixes removed, plus the coding that was removed"""
+        tags, stripped = [], None
+        for tag in (t.strip() for t in if_none_match.split(",")):
+            for coding in ("gzip", "br"):
+                suffix = f'-{coding}"'
+                if tag.endswith(suffix) and not tag.startswith("W/"):
+                    tag, stripped = tag[:-len(suffix)] + '"', coding
+                    break
+            tags.append(tag)
+        return ", ".join(tags), stripped
+
+    @staticmethod
+    def _with_coding(etag: str, coding: str) -> str:
+        if etag.startswith("W/") or not etag.endswith('"'):
+            return etag  # weak validators already allow differing bytes
+        return f'{etag[:-1]}-{coding}"'
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = self._choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        revalidated_coding = None
+        if "if-none-match" in request_headers:
+            if_none_match, revalidated_coding = self._strip_codings(request_headers["if-none-match"])
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            scope = {**scope, "headers": raw + [(b"if-none-match", if_none_match.encode("latin-1"))]}
+
+        start_message = None
+        passthrough = False
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] == 304 and revalidated_coding and "etag" in headers:
+                    # The client holds the compressed representation it revalidated
+                    mutable = MutableHeaders(raw=message["headers"])
+                    mutable["ETag"] = self._with_coding(headers["etag"], revalidated_coding)
+                    mutable.add_vary_header("Accept-Encoding")
+                    passthrough = True
+                    await send(message)
+                    return
+                if (
+                    not headers.get("content-type", "").startswith("application/json")
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if len(body) >= self.minimum_size:
+                body = self._compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = self._with_coding(headers["etag"], encoding)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
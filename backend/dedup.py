@@ -0,0 +1,133 @@
+"""Duplicate-application signatures: normalized URL hash, company key + MinHash/LSH bands over company/position trigrams"""
+import hashlib
+import re
+import zlib
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Query parameters that vary between visits to the same posting
+TRACKING_PARAMS = {
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "ref", "refid", "trk", "trackingid", "src", "source", "gh_src", "lever-source",
+    "from", "origin", "referer", "referrer", "fbclid", "gclid",
+}
+
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "gmbh", "pvt"}
+
+NUM_HASHES = 16
+ROWS_PER_BAND = 2
+SIMILARITY_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_HASH_PARAMS = [
+    (int.from_bytes(hashlib.sha1(f"a{i}".encode()).digest()[:8], "big") | 1,
+     int.from_bytes(hashlib.sha1(f"b{i}".encode()).digest()[:8], "big"))
+    for i in range(NUM_HASHES)
+]
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """Lowercase host, drop scheme/www/fragment/tracking params and trailing slash"""
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS
+    )
+    normalized = host + path
+    if query:
+        normalized += "?" + urlencode(query)
+    return normalized
+
+
+def url_hash(url: Optional[str]) -> Optional[str]:
+    normalized = normalize_url(url)
+    if normalized is None:
+        return None
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def normalize_text(text: Optional[str], is_company: bool = False) -> str:
+    words = re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split()
+    if is_company:
+        words = [w for w in words if w not in COMPANY_SUFFIXES]
+    return " ".join(words)
+
+
+def company_key(company: Optional[str]) -> Optional[str]:
+    """Normalized company name; near matches must agree on it exactly"""
+    return normalize_text(company, is_company=True) or None
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def shingles(company: Optional[str], position: Optional[str]) -> Set[str]:
+    """Trigram shingles, prefixed so company grams never match position grams"""
+    company_norm = normalize_text(company, is_company=True)
+    position_norm = normalize_text(position)
+    return (
+        {"c" + g for g in _trigrams(company_norm)} if company_norm else set()
+    ) | (
+        {"p" + g for g in _trigrams(position_norm)} if position_norm else set()
+    )
+
+
+def minhash_bands(shingle_set: Set[str]) -> List[str]:
+    """LSH band keys; two similar signatures share at least one band with high probability"""
+    if not shingle_set:
+        return []
+    hashes = [zlib.crc32(s.encode()) for s in shingle_set]
+    signature = [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _HASH_PARAMS]
+    bands = []
+    for band in range(NUM_HASHES // ROWS_PER_BAND):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        bands.append(f"{band}:" + ".".join(format(r & 0xFFFFFFFF, "x") for r in rows))
+    return bands
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def position_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Trigram Jaccard of two job titles (company is compared separately, via company_key)"""
+    a_norm, b_norm = normalize_text(a), normalize_text(b)
+    if not a_norm or not b_norm:
+        return 0.0
+    return jaccard(_trigrams(a_norm), _trigrams(b_norm))
+
+
+def is_near_duplicate(company_a: Optional[str], position_a: Optional[str],
+                      company_b: Optional[str], position_b: Optional[str]) -> Optional[float]:
+    """Position similarity when both are at the same company and similar enough, else None.
+
+    Titles are scored on their own so a shared title cannot outweigh a
+    different employer (two companies' "Marketing Analyst" are not duplicates).
+    """
+    key = company_key(company_a)
+    if not key or key != company_key(company_b):
+        return None
+    similarity = position_similarity(position_a, position_b)
+    return similarity if similarity >= SIMILARITY_THRESHOLD else None
+
+
+def signature_fields(company: Optional[str], position: Optional[str], job_url: Optional[str]) -> Dict:
+    """Fields stored on every application document for indexed duplicate lookups"""
+    return {
+        "url_hash": url_hash(job_url),
+        "company_key": company_key(company),
+        "dup_bands": minhash_bands(shingles(company, position)),
+    }
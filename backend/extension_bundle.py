@@ -0,0 +1,185 @@
+"""Content-addressed build of the Chrome extension zip, served with ETag/304/Range support"""
+import hashlib
+import io
+import os
+import threading
+import time
+import zipfile
+from typing import Optional, Tuple
+
+from starlette.responses import Response
+
+# Fixed timestamp so identical sources always produce byte-identical zips
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def iter_source_files(source_dir: str):
+    """Relative paths of the files to package, sorted (hidden files and zips are skipped)"""
+    paths = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith(".") or name.endswith(".zip"):
+                continue
+            paths.append(os.path.relpath(os.path.join(root, name), source_dir).replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def tree_stamp(source_dir: str) -> Tuple:
+    """Cheap change detector: (path, size, mtime) for every source file"""
+    stamp = []
+    for path in iter_source_files(source_dir):
+        stat = os.stat(os.path.join(source_dir, path))
+        stamp.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(stamp)
+
+
+def build_zip(source_dir: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in iter_source_files(source_dir):
+            info = zipfile.ZipInfo(path, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            with open(os.path.join(source_dir, path), "rb") as f:
+                archive.writestr(info, f.read())
+    return buffer.getvalue()
+
+
+class ExtensionBundle:
+    """The current zip of source_dir, named by the SHA-256 of its bytes.
+
+    current() re-checks the source tree at most every check_interval
+    seconds and rebuilds only when a file was added, removed or modified.
+    """
+
+    def __init__(self, source_dir: str, output_dir: Optional[str] = None, check_interval: float = 2.0):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.check_interval = check_interval
+        self.data: Optional[bytes] = None
+        self.digest: Optional[str] = None
+        self.path: Optional[str] = None
+        self.built_at: Optional[float] = None
+        self.builds = 0
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def short_hash(self) -> Optional[str]:
+        return self.digest[:16] if self.digest else None
+
+    @property
+    def etag(self) -> Optional[str]:
+        return f'"{self.digest}"' if self.digest else None
+
+    @property
+    def filename(self) -> Optional[str]:
+        return f"jobfill-extension-{self.short_hash}.zip" if self.digest else None
+
+    def current(self, force: bool = False) -> bool:
+        """Rebuild if the sources changed; returns whether a bundle is available"""
+        if not force and self.data is not None and time.monotonic() - self._checked < self.check_interval:
+            return True
+        with self._lock:
+            self._checked = time.monotonic()
+            if not os.path.isdir(self.source_dir):
+                return self.data is not None
+            stamp = tree_stamp(self.source_dir)
+            if stamp != self._stamp or self.data is None:
+                self._build(stamp)
+            return True
+
+    def _build(self, stamp):
+        data = build_zip(self.source_dir)
+        digest = hashlib.sha256(data).hexdigest()
+        self._stamp = stamp
+        if digest == self.digest:
+            return  # touched but unchanged
+        self.data, self.digest = data, digest
+        self.built_at = time.time()
+        self.builds += 1
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, self.filename)
+            if not os.path.exists(path):
+                tmp = f"{path}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            self.path = path
+
+    def info(self) -> dict:
+        return {
+            "available": self.data is not None,
+            "hash": self.digest,
+            "filename": self.filename,
+            "size": len(self.data) if self.data else 0,
+            "built_at": self.built_at,
+            "builds": self.builds,
+        }
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Strong comparison: weak validators (W/"...") never match a byte-range resource
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """'bytes=a-b' / 'bytes=a-' / 'bytes=-n' -> inclusive (start, end).
+
+    Returns None for a header to ignore (malformed or multi-range, served
+    as a full 200) and raises ValueError when the range is unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or first == "") or not (last.isdigit() or last == "") or first == last == "":
+        return None
+    if first == "":
+        if int(last) == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and start > end:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end")
+    return start, min(end, size - 1)
+
+
+def bundle_response(bundle: ExtensionBundle, headers, cache_control: str) -> Response:
+    """Full, partial (206/416) or not-modified (304) response for the bundle"""
+    data, etag = bundle.data, bundle.etag
+    common = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{bundle.filename}"',
+    }
+
+    if_none_match = headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={k: v for k, v in common.items() if k != "Content-Disposition"})
+
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, len(data))
+        except ValueError:
+            return Response(status_code=416, headers={**common, "Content-Range": f"bytes */{len(data)}"})
+        if byte_range:
+            start, end = byte_range
+            return Response(
+                data[start:end + 1],
+                status_code=206,
+                media_type="application/zip",
+                headers={**common, "Content-Range": f"bytes {start}-{end}/{len(data)}"}
+            )
+
+    return Response(data, media_type="application/zip", headers=common)
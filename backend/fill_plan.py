@@ -0,0 +1,199 @@
+"""Precomputed fill plan: every value variant a form may ask for, derived once per profile version"""
+import hashlib
+import json
+import re
+from datetime import date
+from typing import Any, Dict, Optional
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+_MONTH_LOOKUP = {m.lower()[:3]: i + 1 for i, m in enumerate(MONTHS)}
+
+# Calling codes / ISO alpha-3 for the countries profiles are likely to use
+CALLING_CODES = {"US": "1", "CA": "1", "IN": "91", "GB": "44", "AU": "61", "DE": "49", "FR": "33"}
+ALPHA3 = {"US": "USA", "CA": "CAN", "IN": "IND", "GB": "GBR", "AU": "AUS", "DE": "DEU", "FR": "FRA"}
+# ITU calling codes recognised after a "+" (the full code set is prefix-free, so any match is the code)
+KNOWN_CALLING_CODES = set(CALLING_CODES.values()) | set("""
+    7 20 27 30 31 32 34 36 39 40 41 43 45 46 47 48 51 52 53 54 55 56 57 58 60 62 63 64 65
+    66 81 82 84 86 90 92 93 94 95 98 212 213 216 218 234 254 255 256 263 351 352 353 354
+    358 359 370 371 372 380 381 385 386 420 421 852 853 855 880 886 960 961 962 963 964 965
+    966 967 968 970 971 972 973 974 975 976 977 992 993 994 995 996 998
+""".split())
+
+
+def parse_profile_date(value: Optional[str]):
+    """'Aug 2025', 'Sept 2020', '2019', '2024-05' -> (year, month or None)"""
+    if not value:
+        return None
+    text = value.strip()
+    match = re.fullmatch(r"(\d{4})-(\d{1,2})(?:-\d{1,2})?", text)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = re.fullmatch(r"(\d{1,2})/(\d{4})", text)
+    if match:
+        return int(match.group(2)), int(match.group(1))
+    match = re.fullmatch(r"([A-Za-z]+)\.?\s+(\d{4})", text)
+    if match and match.group(1).lower()[:3] in _MONTH_LOOKUP:
+        return int(match.group(2)), _MONTH_LOOKUP[match.group(1).lower()[:3]]
+    match = re.fullmatch(r"(\d{4})", text)
+    if match:
+        return int(match.group(1)), None
+    return None
+
+
+def date_formats(value: Optional[str]) -> Dict[str, Optional[str]]:
+    parsed = parse_profile_date(value)
+    if parsed is None:
+        return {"raw": value, "year": None}
+    year, month = parsed
+    formats = {"raw": value, "year": str(year)}
+    if month:
+        formats.update({
+            "month": f"{month:02d}",
+            "iso": f"{year}-{month:02d}",
+            "mm_yyyy": f"{month:02d}/{year}",
+            "month_year": f"{MONTHS[month - 1]} {year}",
+            "mon_year": f"{MONTHS[month - 1][:3]} {year}",
+        })
+    return formats
+
+
+def _split_calling_code(digits: str):
+    """(calling code, national digits) for the digits after a "+", or (None, None) if the code is unknown"""
+    for length in (1, 2, 3):
+        if digits[:length] in KNOWN_CALLING_CODES:
+            return digits[:length], digits[length:]
+    return None, None
+
+
+def phone_formats(phone: Optional[str], country_code: Optional[str]) -> Dict[str, Optional[str]]:
+    """Phone variants. A "+" number carries its own calling code, whatever the profile
+    country; without one, E.164 needs a known country (it is None otherwise)."""
+    digits = re.sub(r"\D", "", phone or "")
+    if not digits:
+        return {"raw": phone}
+    if phone.strip().startswith("+"):
+        calling, national = _split_calling_code(digits)
+        if calling is None:
+            return {"raw": phone, "e164": f"+{digits}", "country_calling_code": None,
+                    "national_digits": None, "national": None}
+    else:
+        calling = CALLING_CODES.get((country_code or "").upper())
+        if calling and digits.startswith(calling) and len(digits) > 10:
+            national = digits[len(calling):]
+        else:
+            national = digits
+    formats = {
+        "raw": phone,
+        "e164": f"+{calling}{national}" if calling else None,
+        "country_calling_code": f"+{calling}" if calling else None,
+        "national_digits": national,
+    }
+    if calling == "1" and len(national) == 10:
+        formats["national"] = f"({national[:3]}) {national[3:6]}-{national[6:]}"
+        formats["dashed"] = f"{national[:3]}-{national[3:6]}-{national[6:]}"
+        formats["dotted"] = f"{national[:3]}.{national[3:6]}.{national[6:]}"
+    else:
+        formats["national"] = national
+    return formats
+
+
+def _url(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return value if value.startswith("http") else f"https://{value}"
+
+
+def _leading_number(value: Optional[str]) -> Optional[str]:
+    match = re.match(r"\d+(?:\.\d+)?", value or "")
+    return match.group(0) if match else None
+
+
+def years_of_experience(work_experience, today: Optional[date] = None) -> Optional[int]:
+    """Span from the earliest start to today (roles overlap, so spans are not summed)"""
+    today = today or date.today()
+    starts = [parse_profile_date(exp.get("start_date")) for exp in work_experience]
+    starts = [s for s in starts if s]
+    if not starts:
+        return None
+    year, month = min(starts, key=lambda s: (s[0], s[1] or 1))
+    return max(0, (today.year - year) - (1 if today.month < (month or 1) else 0))
+
+
+def build_fill_plan(profile: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    personal = profile.get("personal_info", {}) or {}
+    name_parts = (personal.get("full_name") or "").split()
+    country_code = (personal.get("country_code") or "").upper()
+
+    experience = []
+    for exp in profile.get("work_experience", []) or []:
+        experience.append({
+            "title": exp.get("title"),
+            "company": exp.get("company"),
+            "location": exp.get("location"),
+            "current": bool(exp.get("current")),
+            "start": date_formats(exp.get("start_date")),
+            "end": date_formats(exp.get("end_date")) if exp.get("end_date") else None,
+            "description": exp.get("description"),
+        })
+
+    education = []
+    for edu in profile.get("education", []) or []:
+        education.append({
+            "degree": edu.get("degree"),
+            "field": edu.get("field"),
+            "institution": edu.get("institution"),
+            "location": edu.get("location"),
+            "gpa": edu.get("gpa"),
+            "gpa_value": _leading_number(edu.get("gpa")),
+            "start": date_formats(edu.get("start_date")),
+            "end": date_formats(edu.get("end_date")),
+        })
+
+    city, state = personal.get("city"), personal.get("state")
+    return {
+        "name": {
+            "full": personal.get("full_name"),
+            "first": name_parts[0] if name_parts else "",
+            "middle": " ".join(name_parts[1:-1]),
+            "last": name_parts[-1] if len(name_parts) > 1 else "",
+            "last_full": " ".join(name_parts[1:]),
+            "initials": "".join(p[0].upper() for p in name_parts),
+            "preferred": name_parts[0] if name_parts else "",
+        },
+        "email": personal.get("email"),
+        "phone": phone_formats(personal.get("phone"), country_code),
+        "links": {
+            "linkedin": personal.get("linkedin"),
+            "linkedin_url": _url(personal.get("linkedin")),
+            "github_url": _url(personal.get("github")),
+            "website_url": _url(personal.get("website") or personal.get("portfolio")),
+        },
+        "address": {
+            "street": personal.get("street_address"),
+            "city": city,
+            "state_code": state,
+            "state_full": personal.get("state_full"),
+            "zip": personal.get("zip_code"),
+            "country": personal.get("country"),
+            "country_code": country_code or None,
+            "country_alpha3": ALPHA3.get(country_code),
+            "city_state": ", ".join(p for p in (city, state) if p),
+            "location": personal.get("location"),
+        },
+        "experience": experience,
+        "current_title": experience[0]["title"] if experience else None,
+        "current_company": experience[0]["company"] if experience else None,
+        "years_experience": years_of_experience(profile.get("work_experience", []) or [], today),
+        "education": education,
+        "highest_degree": education[0]["degree"] if education else None,
+        "skills_csv": ", ".join(profile.get("skills", []) or []),
+        "languages_csv": ", ".join(profile.get("languages", []) or []),
+        "certifications": [c.get("name") for c in profile.get("certifications", []) or []],
+        "summary": profile.get("summary"),
+    }
+
+
+def plan_hash(plan: Dict[str, Any]) -> str:
+    canonical = json.dumps(plan, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
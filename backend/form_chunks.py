@@ -0,0 +1,55 @@
+"""Split large field sets into size-bounded chunks and analyze them concurrently"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def chunk_items(items: Sequence[T], size_of: Callable[[T], int], max_items: int, max_chars: int) -> List[List[T]]:
+    """Greedy, order-preserving chunks bounded by item count and total size.
+
+    An item larger than max_chars gets a chunk of its own.
+    """
+    chunks: List[List[T]] = []
+    current: List[T] = []
+    current_size = 0
+    for item in items:
+        size = size_of(item)
+        if current and (len(current) >= max_items or current_size + size > max_chars):
+            chunks.append(current)
+            current, current_size = [], 0
+        current.append(item)
+        current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def run_chunks(
+    chunks: Sequence[Sequence[T]],
+    worker: Callable[[Sequence[T]], Awaitable[Any]],
+    concurrency: int = 4,
+    retries: int = 1,
+    no_retry: Tuple[type, ...] = (),
+) -> List[Tuple[Optional[Any], Optional[Exception]]]:
+    """Run worker on every chunk with at most `concurrency` in flight.
+
+    Each chunk retries on its own (up to `retries` extra attempts, never for
+    `no_retry` exceptions), so one failing chunk never re-runs the ones that
+    succeeded. Returns (result, error) per chunk, in chunk order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(chunk):
+        error = None
+        for _ in range(retries + 1):
+            async with semaphore:
+                try:
+                    return await worker(chunk), None
+                except Exception as e:
+                    error = e
+                    if isinstance(e, no_retry):
+                        break
+        return None, error
+
+    return list(await asyncio.gather(*(run_one(chunk) for chunk in chunks)))
@@ -0,0 +1,157 @@
+"""In-process event broker for live dashboard updates over Server-Sent Events"""
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def stats_delta(before: Optional[dict], after: Optional[dict], statuses: Sequence[str],
+                platforms: Sequence[str], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Change to /api/applications/stats when one application goes from before to after.
+
+    Either side may be None (create/delete). Mirrors compute_application_stats:
+    only the listed statuses/platforms are counted, and the weekly/today
+    windows compare applied_date as ISO strings. Zero entries are omitted.
+    """
+    now = now or datetime.utcnow()
+    week_ago = (now - timedelta(days=7)).isoformat()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+    delta: Dict[str, Any] = {"total": 0, "status_breakdown": {}, "platform_breakdown": {},
+                             "weekly_applications": 0, "today_applications": 0}
+
+    def apply(doc: Optional[dict], sign: int):
+        if doc is None:
+            return
+        delta["total"] += sign
+        status, platform = doc.get("status"), doc.get("platform")
+        if status in statuses:
+            delta["status_breakdown"][status] = delta["status_breakdown"].get(status, 0) + sign
+        if platform in platforms:
+            delta["platform_breakdown"][platform] = delta["platform_breakdown"].get(platform, 0) + sign
+        applied = doc.get("applied_date") or ""
+        if applied >= week_ago:
+            delta["weekly_applications"] += sign
+        if applied >= today:
+            delta["today_applications"] += sign
+
+    apply(before, -1)
+    apply(after, 1)
+    for key in ("status_breakdown", "platform_breakdown"):
+        delta[key] = {k: v for k, v in delta[key].items() if v}
+    return {k: v for k, v in delta.items() if v}
+
+
+class Subscriber:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+
+class EventBroker:
+    """Fans events out to subscribers and keeps the last buffer_size for resume.
+
+    Event ids are "<boot>-<seq>". A client reconnecting with a Last-Event-ID
+    from this process that is still buffered gets exactly the events it
+    missed; anything else (restart, too far behind, a subscriber queue that
+    overflowed) gets a resync event and should refetch its state.
+    Publish from the event loop thread.
+    """
+
+    def __init__(self, buffer_size: int = 1000, subscriber_queue: int = 256):
+        self.boot = format(int(time.time()), "x")
+        self.buffer_size = buffer_size
+        self.subscriber_queue = subscriber_queue
+        self._seq = 0
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._subscribers: List[Subscriber] = []
+        self.counters = {"published": 0, "resumed": 0, "resyncs": 0, "overflows": 0}
+
+    @property
+    def last_id(self) -> str:
+        return f"{self.boot}-{self._seq}"
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> str:
+        self._seq += 1
+        event = (self.last_id, event_type, data)
+        self._buffer.append((self._seq, event))
+        self.counters["published"] += 1
+        for subscriber in self._subscribers:
+            if subscriber.overflowed:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self.counters["overflows"] += 1
+        return event[0]
+
+    def _missed(self, last_event_id: Optional[str]) -> Optional[List[Tuple[str, str, Dict[str, Any]]]]:
+        """Buffered events after last_event_id, or None when they cannot be replayed"""
+        boot, _, seq = (last_event_id or "").partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq == self._seq:
+            return []
+        if seq > self._seq or not self._buffer or self._buffer[0][0] > seq + 1:
+            return None
+        return [event for event_seq, event in self._buffer if event_seq > seq]
+
+    def subscribe(self, last_event_id: Optional[str] = None):
+        """Returns (subscriber, replay); replay is None when the client must resync"""
+        subscriber = Subscriber(self.subscriber_queue)
+        replay = self._missed(last_event_id) if last_event_id else []
+        if replay is None:
+            self.counters["resyncs"] += 1
+        elif replay:
+            self.counters["resumed"] += 1
+        self._subscribers.append(subscriber)
+        return subscriber, replay
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"subscribers": len(self._subscribers), "last_event_id": self.last_id,
+                "buffered": len(self._buffer), **self.counters}
+
+
+def format_sse(event_id: Optional[str], event_type: str, data: Any) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(broker: EventBroker, last_event_id: Optional[str] = None,
+                       heartbeat: float = 15.0, retry_ms: int = 3000):
+    """SSE body for one client: replay or resync, then live events and heartbeats"""
+    subscriber, replay = broker.subscribe(last_event_id)
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        if replay is None:
+            yield format_sse(broker.last_id, "resync", {"reason": "cannot resume"})
+        else:
+            for event in replay:
+                yield format_sse(*event)
+        while True:
+            if subscriber.overflowed:
+                # Too slow to keep up: drop the backlog and have the client refetch
+                broker.unsubscribe(subscriber)
+                subscriber, _ = broker.subscribe()
+                broker.counters["resyncs"] += 1
+                yield format_sse(broker.last_id, "resync", {"reason": "overflow"})
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_sse(*event)
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,222 @@
+"""Multi-provider LLM routing with rolling latency/error tracking and hedged requests"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List, Optional, Dict, Any
+
+import httpx
+
+
+class ProviderStats:
+    """Rolling latency and error window for a single provider"""
+
+    def __init__(self, window: int = 50):
+        self.samples = deque(maxlen=window)  # (latency_ms, ok)
+        self.total_calls = 0
+        self.total_errors = 0
+        self.hedge_wins = 0
+
+    def record(self, latency_ms: float, ok: bool):
+        self.samples.append((latency_ms, ok))
+        self.total_calls += 1
+        if not ok:
+            self.total_errors += 1
+
+    @property
+    def avg_latency_ms(self) -> Optional[float]:
+        latencies = [lat for lat, ok in self.samples if ok]
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def score(self, default_latency_ms: float) -> float:
+        """Lower is better; errors inflate the expected latency"""
+        latency = self.avg_latency_ms
+        if latency is None:
+            latency = default_latency_ms
+        return latency * (1 + 4 * self.error_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        avg = self.avg_latency_ms
+        return {
+            "avg_latency_ms": round(avg, 1) if avg is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "window_size": len(self.samples),
+            "total_calls": self.total_calls,
+            "total_errors": self.total_errors,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class LLMProvider(ABC):
+    """Base provider: subclasses return the completion text for a chat request"""
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 2000) -> str:
+        """Completion text for messages"""
+
+    async def aclose(self):
+        """Release connections held by the provider"""
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI-compatible chat completions (used for both Emergent and OpenAI)"""
+
+    def __init__(self, name: str, client, model: str = "gpt-4o-mini"):
+        self.name = name
+        self.client = client
+        self.model = model
+
+    async def complete(self, messages, temperature=0.3, max_tokens=2000):
+        # The OpenAI client is synchronous; keep it off the event loop. Cancelling
+        # this coroutine cannot stop the worker thread, so the HTTP call runs to
+        # completion (and is billed) even when a hedge has already been won.
+        response = await asyncio.to_thread(
+            self.client.chat.completions.create,
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content.strip()
+
+
+class ClaudeProvider(LLMProvider):
+    """Anthropic Messages API over one pooled HTTP client (created on first use)"""
+    name = "claude"
+
+    def __init__(self, api_key: str, model: str = "claude-3-5-haiku-latest", timeout: float = 30.0):
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def complete(self, messages, temperature=0.3, max_tokens=2000):
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        chat = [m for m in messages if m["role"] != "system"]
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": chat,
+        }
+        if system:
+            payload["system"] = system
+        response = await self._client().post(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json",
+            },
+            json=payload,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return "".join(block.get("text", "") for block in data.get("content", [])).strip()
+
+
+class LLMRouter:
+    """Routes completions to the preferred provider and optionally hedges to the next-fastest one"""
+
+    def __init__(self, window: int = 50, default_latency_ms: float = 3000.0):
+        self.window = window
+        self.default_latency_ms = default_latency_ms
+        self.stats: Dict[str, ProviderStats] = {}
+
+    def _stats(self, name: str) -> ProviderStats:
+        if name not in self.stats:
+            self.stats[name] = ProviderStats(self.window)
+        return self.stats[name]
+
+    def rank(self, providers: List[LLMProvider], preferred: Optional[str] = None) -> List[LLMProvider]:
+        """Preferred provider first, remaining providers ordered by rolling score"""
+        ordered = sorted(providers, key=lambda p: self._stats(p.name).score(self.default_latency_ms))
+        primary = [p for p in ordered if p.name == preferred]
+        return primary + [p for p in ordered if p.name != preferred]
+
+    async def _timed(self, provider: LLMProvider, messages, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            result = await provider.complete(messages, **kwargs)
+        except asyncio.CancelledError:
+            # A cancelled hedge loser says nothing about provider health
+            raise
+        except Exception:
+            self._stats(provider.name).record((time.perf_counter() - start) * 1000, False)
+            raise
+        self._stats(provider.name).record((time.perf_counter() - start) * 1000, True)
+        return result
+
+    async def complete(
+        self,
+        providers: List[LLMProvider],
+        messages: List[Dict[str, str]],
+        preferred: Optional[str] = None,
+        hedge_delay: Optional[float] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Run a completion; returns {"text", "provider", "hedged"}.
+
+        With hedge_delay (seconds), a second request goes to the next-ranked provider
+        if the primary has not answered in time (or fails early), and the first
+        successful answer wins. The loser is cancelled, but a provider that runs
+        its call in a worker thread (OpenAIProvider) cannot be interrupted: that
+        request still completes upstream and spends quota, so a hedge can cost
+        up to two calls.
+        """
+        if not providers:
+            raise RuntimeError("No LLM providers configured")
+
+        ordered = self.rank(providers, preferred)
+        primary = ordered[0]
+
+        if hedge_delay is None or len(ordered) < 2:
+            text = await self._timed(primary, messages, **kwargs)
+            return {"text": text, "provider": primary.name, "hedged": False}
+
+        backup = ordered[1]
+        tasks = {asyncio.create_task(self._timed(primary, messages, **kwargs)): primary}
+        errors = []
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            for task in done:
+                if task.exception() is None:
+                    return {"text": task.result(), "provider": primary.name, "hedged": False}
+                errors.append(task.exception())
+                del tasks[task]
+
+            tasks[asyncio.create_task(self._timed(backup, messages, **kwargs))] = backup
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks.pop(task)
+                    if task.exception() is None:
+                        if provider is backup:
+                            self._stats(backup.name).hedge_wins += 1
+                        return {"text": task.result(), "provider": provider.name, "hedged": True}
+                    errors.append(task.exception())
+            raise errors[-1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
@@ -0,0 +1,169 @@
+"""Translate field-path / JSON-Patch operations into targeted MongoDB update operators"""
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class PatchError(ValueError):
+    """Invalid path, operation or value"""
+
+
+def parse_path(path: str) -> List[str]:
+    """Accept JSON Pointer ("/personal_info/phone") or dotted ("personal_info.phone") paths"""
+    if path.startswith("/"):
+        segments = [s.replace("~1", "/").replace("~0", "~") for s in path[1:].split("/")]
+    else:
+        segments = path.split(".")
+    if not segments or any(s == "" for s in segments):
+        raise PatchError(f"Invalid path: {path!r}")
+    return segments
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def resolve_type(segments: List[str], root_model, extra_fields: Optional[Dict[str, Any]] = None):
+    """Walk the model annotations along the path; returns (annotation, nullable)"""
+    current, nullable = root_model, False
+    for i, segment in enumerate(segments):
+        current, _ = _unwrap_optional(current)
+        origin = get_origin(current)
+        if origin is list:
+            if not (segment.isdigit() or segment == "-"):
+                raise PatchError(f"Expected an array index at {'.'.join(segments[:i + 1])!r}")
+            current, nullable = get_args(current)[0], False
+        elif origin is dict:
+            current, nullable = get_args(current)[1], False
+        elif isinstance(current, type) and issubclass(current, BaseModel):
+            if i == 0 and extra_fields and segment in extra_fields:
+                current = extra_fields[segment]
+            elif segment in current.model_fields:
+                current = current.model_fields[segment].annotation
+            else:
+                raise PatchError(f"Unknown field: {'.'.join(segments[:i + 1])!r}")
+            current, nullable = _unwrap_optional(current)
+        else:
+            raise PatchError(f"Cannot descend into {'.'.join(segments[:i])!r}")
+    return current, nullable
+
+
+def _validate(annotation, value):
+    adapter = TypeAdapter(annotation)
+    try:
+        return adapter.dump_python(adapter.validate_python(value))
+    except ValidationError as e:
+        raise PatchError(str(e))
+
+
+def _item_type(segments, root_model, extra_fields):
+    annotation, _ = resolve_type(segments, root_model, extra_fields)
+    if get_origin(annotation) is not list:
+        raise PatchError(f"{'.'.join(segments)!r} is not an array")
+    return get_args(annotation)[0]
+
+
+def compile_patch(operations: List[Dict[str, Any]], root_model, extra_fields=None) -> Tuple[Dict[str, Any], List[str]]:
+    """Build one MongoDB update document from the operations.
+
+    Field-path ops: set, unset, push, pull. JSON-Patch ops: add, replace,
+    remove. Array indices refer to the document as it was read. Returns the
+    update and the arrays that need a follow-up {$pull: null} (element
+    removal by index is $unset + $pull, since MongoDB has no positional delete).
+    """
+    update: Dict[str, Dict[str, Any]] = {}
+    compact_arrays: List[str] = []
+
+    def put(operator, key, value):
+        update.setdefault(operator, {})
+        if key in update[operator]:
+            raise PatchError(f"Multiple {operator} operations on {key!r}")
+        update[operator][key] = value
+
+    for operation in operations:
+        op, segments = operation["op"], parse_path(operation["path"])
+        value = operation.get("value")
+        key = ".".join(segments)
+        last = segments[-1]
+
+        if op in ("set", "replace") or (op == "add" and not (last == "-" or last.isdigit())):
+            annotation, _ = resolve_type(segments, root_model, extra_fields)
+            put("$set", key, _validate(annotation, value))
+        elif op == "push" or (op == "add" and last == "-"):
+            array_segments = segments if op == "push" else segments[:-1]
+            item = _validate(_item_type(array_segments, root_model, extra_fields), value)
+            array_key = ".".join(array_segments)
+            pushes = update.setdefault("$push", {})
+            if "$position" in pushes.get(array_key, {}):
+                # One $push per array: appends cannot share an insert-at-index $each
+                raise PatchError(f"Multiple $push operations on {array_key!r}")
+            pushes.setdefault(array_key, {"$each": []})["$each"].append(item)
+        elif op == "add":
+            array_segments = segments[:-1]
+            item = _validate(_item_type(array_segments, root_model, extra_fields), value)
+            put("$push", ".".join(array_segments), {"$each": [item], "$position": int(last)})
+        elif op == "pull":
+            item_type = _item_type(segments, root_model, extra_fields)
+            # Objects are match conditions (e.g. {"id": "exp3"}); scalars are validated as items
+            match = value if isinstance(value, dict) else _validate(item_type, value)
+            put("$pull", key, match)
+        elif op in ("unset", "remove"):
+            if last.isdigit():
+                resolve_type(segments, root_model, extra_fields)
+                put("$unset", key, "")
+                array_key = ".".join(segments[:-1])
+                if array_key not in compact_arrays:
+                    compact_arrays.append(array_key)
+            else:
+                _, nullable = resolve_type(segments, root_model, extra_fields)
+                if not nullable:
+                    raise PatchError(f"{key!r} is required and cannot be removed")
+                put("$set", key, None)
+        else:
+            raise PatchError(f"Unsupported operation: {op!r}")
+
+    if not update:
+        raise PatchError("No operations")
+    return update, compact_arrays
+
+
+def apply_index_removals(update: Dict[str, Any], compact_arrays: List[str], document: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace "$unset array.N" entries with a $set of the compacted array.
+
+    The result is a single write, so with a version-checked filter no reader
+    ever sees the null hole an $unset leaves behind. Other operations on the
+    same array then conflict in MongoDB and the write fails.
+    """
+    unset = dict(update.get("$unset", {}))
+    for array_key in compact_arrays:
+        prefix = f"{array_key}."
+        indices = {int(k[len(prefix):]) for k in list(unset) if k.startswith(prefix) and k[len(prefix):].isdigit()}
+        for index in indices:
+            del unset[f"{prefix}{index}"]
+
+        current: Any = document
+        for segment in array_key.split("."):
+            if isinstance(current, list) and segment.isdigit() and int(segment) < len(current):
+                current = current[int(segment)]
+            elif isinstance(current, dict):
+                current = current.get(segment)
+            else:
+                current = None
+        if not isinstance(current, list):
+            raise PatchError(f"{array_key!r} is not an array in the stored profile")
+        if any(i >= len(current) for i in indices):
+            raise PatchError(f"Index out of range for {array_key!r}")
+
+        if array_key in update.get("$set", {}):
+            raise PatchError(f"Multiple $set operations on {array_key!r}")
+        update.setdefault("$set", {})[array_key] = [item for i, item in enumerate(current) if i not in indices]
+
+    if unset:
+        update["$unset"] = unset
+    else:
+        update.pop("$unset", None)
+    return update
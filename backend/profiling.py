@@ -0,0 +1,216 @@
+"""Opt-in per-request profiling: a stack sampler plus named phase timings"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class RequestProfile:
+    """Samples the stacks of the threads working on one request.
+
+    The event loop thread is sampled for the whole request; a worker thread
+    (asyncio.to_thread) is sampled while it is inside a phase(). Awaited
+    coroutines are off the stack while suspended, so time spent waiting on
+    Mongo or the LLM shows up in the phase timings rather than the stacks.
+    """
+
+    def __init__(self, method: str, path: str, reason: str, interval: float = 0.005):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.interval = interval
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.phases: List[Dict[str, Any]] = []
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._threads = {threading.get_ident(): 1}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.id}", daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 2)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads)
+            for ident in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+                    self.samples += 1
+
+    def _enter_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def _leave_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] -= 1
+            if not self._threads[ident]:
+                del self._threads[ident]
+
+    def record(self, name: str, start: float, end: float):
+        self.phases.append({
+            "name": name,
+            "start_ms": round((start - self.started) * 1000, 2),
+            "duration_ms": round((end - start) * 1000, 2),
+            "thread": threading.current_thread().name,
+        })
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Total time per phase name (phases can overlap, e.g. concurrent LLM chunks)"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for p in self.phases:
+            entry = totals.setdefault(p["name"], {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + p["duration_ms"], 2)
+        return totals
+
+    def folded(self) -> str:
+        """Collapsed stacks ("frame;frame;frame count"), as read by flamegraph.pl and speedscope"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "reason": self.reason,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "sample_interval_ms": self.interval * 1000,
+            "breakdown": self.breakdown(),
+            "phases": self.phases,
+        }
+
+
+@contextmanager
+def phase(name: str):
+    """Time a named phase of the current request; a no-op unless it is being profiled"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profile._enter_thread(ident)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(name, start, time.perf_counter())
+        profile._leave_thread(ident)
+
+
+class ProfileStore:
+    """The most recent captures, newest last"""
+
+    def __init__(self, keep: int = 50):
+        self._profiles = deque(maxlen=keep)
+
+    def add(self, profile: RequestProfile):
+        self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [p.summary() for p in reversed(self._profiles)]
+
+
+class ProfilingMiddleware:
+    """Profile a request when it carries the admin header, or by sampling rate.
+
+    Profiled responses get an X-Profile-Id header naming the capture.
+    Install it only when profiling is configured, so requests pay nothing
+    otherwise. The profile endpoints and long-lived event streams are never
+    profiled (a stream would keep a sampler thread running until it closes).
+    """
+
+    def __init__(self, app, store: ProfileStore, admin_token: Optional[str] = None,
+                 sample_rate: float = 0.0, path_prefix: str = "/api/",
+                 exclude_prefixes: Tuple[str, ...] = ("/api/debug/", "/api/events/")):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+        self.exclude_prefixes = exclude_prefixes
+
+    def _reason(self, scope) -> Optional[str]:
+        path = scope["path"]
+        if not path.startswith(self.path_prefix) or path.startswith(self.exclude_prefixes):
+            return None
+        if self.admin_token:
+            supplied = Headers(scope=scope).get("x-profile", "").encode()
+            if hmac.compare_digest(supplied, self.admin_token.encode()):
+                return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        reason = self._reason(scope) if scope["type"] == "http" else None
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], reason)
+        token = _current.set(profile)
+        response_started = None
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.id
+            elif message["type"] == "http.response.body" and not message.get("more_body") and response_started:
+                profile.record("send_response", response_started, time.perf_counter())
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            _current.reset(token)
+            self.store.add(profile)
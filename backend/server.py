@@ -1,16 +1,39 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timedelta, date
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import logging
 import os
 import json
+import re
+import tempfile
+import time
 from openai import OpenAI
-from pymongo import MongoClient
+from pymongo import MongoClient, DeleteOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import CollectionInvalid, OperationFailure
 from bson import ObjectId
+from llm_router import LLMRouter, OpenAIProvider, ClaudeProvider
+from compression import JSONCompressionMiddleware
+from admission import AdmissionController, AdmissionRejected
+from analytics import ApplicationSnapshot, StatusHistory, DELETED_STATUS
+from profile_patch import apply_index_removals, compile_patch, PatchError
+from fill_plan import build_fill_plan, plan_hash
+from work_queue import WorkQueue, QueueFull
+from form_chunks import chunk_items, run_chunks
+from single_flight import SingleFlight, Disconnected, fingerprint
+from profiling import ProfileStore, ProfilingMiddleware, phase
+from extension_bundle import ExtensionBundle, bundle_response
+from live_events import EventBroker, event_stream, stats_delta
+from dedup import signature_fields, company_key, is_near_duplicate, url_hash
 
 app = FastAPI(title="JobFill AI API", version="1.0.0")
+logger = logging.getLogger(__name__)
 
 # CORS
 app.add_middleware(
@@ -21,6 +44,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses above the threshold (profile/bootstrap payloads are large)
+app.add_middleware(
+    JSONCompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+)
+
+# Opt-in request profiling (X-Profile: <token> header, or a sampled fraction of requests)
+PROFILE_ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+profile_store = ProfileStore(keep=int(os.environ.get("PROFILE_KEEP", "50")))
+if PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        admin_token=PROFILE_ADMIN_TOKEN,
+        sample_rate=PROFILE_SAMPLE_RATE
+    )
+
 # MongoDB setup
 MONGO_URL = os.environ.get("MONGO_URL")
 DB_NAME = os.environ.get("DB_NAME", "jobfill_db")
@@ -31,6 +72,15 @@ db = client[DB_NAME]
 profiles_collection = db["profiles"]
 applications_collection = db["applications"]
 settings_collection = db["settings"]
+archive_collection = db["applications_archive"]
+saved_jobs_collection = db["saved_jobs"]
+status_history_collection = db["application_status_history"]  # append-only
+
+# Archival policy: applications in these statuses, applied more than N days ago, move to the cold tier
+ARCHIVE_STATUSES = [s.strip() for s in os.environ.get("ARCHIVE_STATUSES", "Rejected").split(",") if s.strip()]
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get("ARCHIVE_INTERVAL_HOURS", "6"))
+ARCHIVE_BATCH_SIZE = 500
 
 # OpenAI client with Emergent key
 EMERGENT_KEY = os.environ.get("EMERGENT_LLM_KEY", "sk-emergent-3Fe1c14F84b040fC67")
@@ -39,6 +89,72 @@ openai_client = OpenAI(
     base_url="https://api.emergentagent.com/v1"
 )
 
+# LLM provider routing; hedging is off unless a delay is configured
+LLM_HEDGE_DELAY_MS = int(os.environ.get("LLM_HEDGE_DELAY_MS", "0"))
+llm_router = LLMRouter()
+_provider_cache = {}
+
+# Admission control for AI analysis: per-client token buckets + bounded global queue
+ai_admission = AdmissionController(
+    max_concurrency=int(os.environ.get("AI_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.environ.get("AI_MAX_QUEUE", "16")),
+    max_wait=float(os.environ.get("AI_MAX_WAIT_SECONDS", "2")),
+    client_rate=float(os.environ.get("AI_CLIENT_RATE_PER_SEC", "0.5")),
+    client_burst=float(os.environ.get("AI_CLIENT_BURST", "5")),
+    clients_per_address=float(os.environ.get("AI_CLIENTS_PER_ADDRESS", "4"))
+)
+# Proxies in front of the app that append to X-Forwarded-For (the ingress)
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "1"))
+INSTALL_ID_PATTERN = re.compile(r"[A-Za-z0-9-]{16,64}")
+
+def client_address(request: Request) -> str:
+    """Caller's IP: the X-Forwarded-For entry added by the outermost trusted proxy, else the peer"""
+    forwarded = [a.strip() for a in request.headers.get("x-forwarded-for", "").split(",") if a.strip()]
+    if TRUSTED_PROXY_HOPS and forwarded:
+        # Entries left of the trusted hops are client-supplied and can be forged
+        return forwarded[-min(TRUSTED_PROXY_HOPS, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+def client_identity(request: Request):
+    """(client key, address) for rate limiting: the extension's install id scoped to its address"""
+    address = client_address(request)
+    install_id = request.headers.get("x-client-id", "")
+    if INSTALL_ID_PATTERN.fullmatch(install_id):
+        return f"{install_id}@{address}", address
+    return address, address
+# What a request that is not admitted gets: "fallback" (rule-based answer) or "reject" (429)
+AI_OVERLOAD_RESPONSE = os.environ.get("AI_OVERLOAD_RESPONSE", "fallback")
+ai_overload_counters = {"fallback_served": 0, "rejected_429": 0}
+
+# Identical concurrent analyze-form calls (double clicks, two tabs) share one LLM call
+form_analysis_flights = SingleFlight()
+
+def get_llm_providers(settings: dict):
+    """Build the providers that have credentials in settings (clients are reused per key)"""
+    specs = [("emergent", EMERGENT_KEY)]
+    if settings.get("openai_api_key"):
+        specs.append(("openai", settings["openai_api_key"]))
+    if settings.get("claude_api_key"):
+        specs.append(("claude", settings["claude_api_key"]))
+
+    providers = []
+    for name, key in specs:
+        cache_key = (name, key)
+        if cache_key not in _provider_cache:
+            if name == "emergent":
+                _provider_cache[cache_key] = OpenAIProvider("emergent", openai_client)
+            elif name == "openai":
+                _provider_cache[cache_key] = OpenAIProvider("openai", OpenAI(api_key=key))
+            else:
+                _provider_cache[cache_key] = ClaudeProvider(key)
+        providers.append(_provider_cache[cache_key])
+    return providers
+
+def preferred_provider(settings: dict) -> str:
+    provider = settings.get("ai_provider") or "emergent"
+    # The dashboard offers Codex as an OpenAI model choice
+    return "openai" if provider == "codex" else provider
+
 # Helper to serialize MongoDB documents
 def serialize_doc(doc):
     if doc is None:
@@ -103,6 +219,27 @@ class Profile(BaseModel):
     certifications: List[Certification]
     languages: List[str] = ["English"]
 
+APPLICATION_STATUSES = ["Applied", "In Progress", "Interview", "Rejected", "Offer"]
+STATS_PLATFORMS = ["LinkedIn", "Indeed", "Greenhouse", "Lever", "Workday", "Glassdoor", "ZipRecruiter", "Other"]
+
+class StatusTransition(BaseModel):
+    status: str
+    note: Optional[str] = None
+
+class BulkStatusTransition(BaseModel):
+    ids: List[str]
+    status: str
+    note: Optional[str] = None
+
+class ProfilePatchOperation(BaseModel):
+    op: str  # set, unset, push, pull (field paths) or add, replace, remove (JSON Patch)
+    path: str
+    value: Any = None
+
+class ProfilePatch(BaseModel):
+    version: Optional[int] = None
+    operations: List[ProfilePatchOperation]
+
 class JobApplication(BaseModel):
     id: Optional[str] = None
     company: str
@@ -154,10 +291,24 @@ class FormField(BaseModel):
     label: Optional[str] = None
     options: Optional[List[str]] = None
 
+class DuplicateCheckRequest(BaseModel):
+    company: str
+    position: str
+    job_url: Optional[str] = None
+
 class FormAnalysisRequest(BaseModel):
     fields: List[FormField]
     job_title: Optional[str] = None
     company: Optional[str] = None
+    job_url: Optional[str] = None  # lets analysis reuse a pre-generated result
+
+class SavedJob(BaseModel):
+    job_url: Optional[str] = None
+    job_title: str
+    company: str
+    fields: List[FormField] = []
+    long_form_questions: List[str] = []
+    priority: int = 5  # lower runs first
 
 # Default profile data (Vineeth's info)
 DEFAULT_PROFILE = {
@@ -369,6 +520,71 @@ DEFAULT_SETTINGS = {
     "claude_api_key": None
 }
 
+# Columnar analytics snapshot over both tiers; loaded on first use, then kept current by writes
+application_snapshot = ApplicationSnapshot()
+SNAPSHOT_FIELDS = {"status": 1, "platform": 1, "applied_date": 1, "updated_at": 1, "status_changed_at": 1}
+
+def load_application_snapshot():
+    application_snapshot.load(
+        doc
+        for collection in (applications_collection, archive_collection)
+        for doc in collection.find({}, SNAPSHOT_FIELDS)
+    )
+
+# Internal fields kept off API responses
+INTERNAL_APPLICATION_FIELDS = {"dup_bands": 0}
+
+def ensure_archive_collection():
+    """Cold tier uses zstd block compression; only queried fields are indexed"""
+    try:
+        db.create_collection(
+            "applications_archive",
+            storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}}
+        )
+    except CollectionInvalid:
+        pass  # already exists
+    except OperationFailure:
+        # Storage engine without zstd support; fall back to the default compressor
+        db.create_collection("applications_archive")
+    archive_collection.create_index([("applied_date", -1)])
+    archive_collection.create_index("status")
+    archive_collection.create_index("url_hash")
+    archive_collection.create_index("company_key")
+
+@app.on_event("startup")
+def ensure_indexes():
+    """Create duplicate-detection indexes and backfill signatures on older documents"""
+    ensure_archive_collection()
+    saved_jobs_collection.create_index("job_key", unique=True)
+    status_history_collection.create_index([("application_id", 1), ("at", 1)])
+    status_history_collection.create_index([("to_status", 1), ("at", 1)])
+    if status_history_collection.estimated_document_count() == 0:
+        # Seed history with each existing application's current status
+        for collection in (applications_collection, archive_collection):
+            docs = list(collection.find({}, {"status": 1, "applied_date": 1}))
+            if docs:
+                status_history_collection.insert_many([
+                    {"application_id": d["_id"], "from_status": None, "to_status": d.get("status", "Applied"),
+                     "at": d.get("applied_date"), "source": "backfill", "note": None}
+                    for d in docs
+                ])
+    saved_jobs_collection.create_index("status")
+    applications_collection.create_index("url_hash")
+    applications_collection.create_index([("company_key", 1), ("dup_bands", 1)])
+    for doc in applications_collection.find(
+        {"company_key": {"$exists": False}}, {"company": 1, "position": 1, "job_url": 1}
+    ):
+        applications_collection.update_one(
+            {"_id": doc["_id"]},
+            {"$set": signature_fields(doc.get("company"), doc.get("position"), doc.get("job_url"))}
+        )
+    # Archived documents keep the exact-match fields but not the bands
+    for doc in archive_collection.find({"company_key": {"$exists": False}}, {"company": 1, "job_url": 1}):
+        archive_collection.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"url_hash": url_hash(doc.get("job_url")), "company_key": company_key(doc.get("company"))}}
+        )
+
 # API Routes
 
 @app.get("/api/health")
@@ -376,28 +592,150 @@ async def health_check():
     return {"status": "healthy", "service": "JobFill AI API", "version": "1.0.0"}
 
 # Profile Routes
-@app.get("/api/profile")
-async def get_profile():
-    """Get the user's profile data"""
+def load_profile():
     profile = profiles_collection.find_one({"type": "main_profile"})
     if profile:
+        profile.setdefault("version", 0)
         return serialize_doc(profile)
     # Return default profile if none exists
-    return {"_id": "default", **DEFAULT_PROFILE}
+    return {"_id": "default", **DEFAULT_PROFILE, "version": 0}
+
+@app.get("/api/profile")
+async def get_profile():
+    """Get the user's profile data"""
+    return load_profile()
+
+# Profile fields stored outside the Profile model that may still be patched
+PROFILE_EXTRA_FIELDS = {"highlight_tags": List[str]}
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(value.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a profile version")
+
+def profile_version_filter(version: int):
+    # Profiles saved before versioning are version 0
+    if version == 0:
+        return {"type": "main_profile", "$or": [{"version": 0}, {"version": {"$exists": False}}]}
+    return {"type": "main_profile", "version": version}
+
+def current_profile_version():
+    doc = profiles_collection.find_one({"type": "main_profile"}, {"version": 1})
+    return doc.get("version", 0) if doc else 0
 
 @app.put("/api/profile")
-async def update_profile(profile: Profile):
-    """Update the user's profile"""
+async def update_profile(profile: Profile, request: Request):
+    """Update the user's profile (If-Match: <version> makes it conditional)"""
     profile_data = profile.model_dump()
     profile_data["type"] = "main_profile"
     profile_data["updated_at"] = datetime.utcnow().isoformat()
     
-    result = profiles_collection.update_one(
-        {"type": "main_profile"},
-        {"$set": profile_data},
-        upsert=True
+    expected = parse_if_match(request.headers.get("if-match"))
+    if expected is None:
+        query = {"type": "main_profile"}
+    else:
+        query = profile_version_filter(expected)
+    
+    updated = profiles_collection.find_one_and_update(
+        query,
+        {"$set": profile_data, "$inc": {"version": 1}},
+        projection={"version": 1},
+        upsert=expected is None,
+        return_document=ReturnDocument.AFTER
+    )
+    if updated is None:
+        raise HTTPException(status_code=409, detail={"message": "Profile was modified by another client", "version": current_profile_version()})
+    return {"success": True, "message": "Profile updated successfully", "version": updated["version"]}
+
+@app.patch("/api/profile")
+async def patch_profile(body: Union[ProfilePatch, List[ProfilePatchOperation]], request: Request):
+    """Apply targeted profile changes with a version check.
+
+    Body: {"version": n, "operations": [{"op", "path", "value"}]} or a raw
+    JSON Patch array (version then comes from If-Match). Returns 409 when the
+    stored version no longer matches.
+    """
+    if isinstance(body, list):
+        patch = ProfilePatch(version=parse_if_match(request.headers.get("if-match")), operations=body)
+    else:
+        patch = body
+        if patch.version is None:
+            patch.version = parse_if_match(request.headers.get("if-match"))
+    if patch.version is None:
+        raise HTTPException(status_code=428, detail="Profile version required (body 'version' or If-Match header)")
+    
+    try:
+        update, compact_arrays = compile_patch([o.model_dump() for o in patch.operations], Profile, PROFILE_EXTRA_FIELDS)
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Materialize the default profile so there is a document to patch
+    if patch.version == 0:
+        profiles_collection.update_one(
+            {"type": "main_profile"},
+            {"$setOnInsert": {**DEFAULT_PROFILE, "type": "main_profile", "version": 0}},
+            upsert=True
+        )
+    
+    def conflict():
+        return HTTPException(status_code=409, detail={"message": "Profile was modified by another client", "version": current_profile_version()})
+    
+    if compact_arrays:
+        # Index removals are written as the compacted array in the same version-checked update
+        current = profiles_collection.find_one(profile_version_filter(patch.version), {key: 1 for key in compact_arrays})
+        if current is None:
+            raise conflict()
+        try:
+            apply_index_removals(update, compact_arrays, current)
+        except PatchError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    update.setdefault("$set", {})["updated_at"] = datetime.utcnow().isoformat()
+    update["$inc"] = {"version": 1}
+    try:
+        updated = profiles_collection.find_one_and_update(
+            profile_version_filter(patch.version),
+            update,
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+    except OperationFailure as e:
+        # e.g. two operations touching overlapping paths
+        raise HTTPException(status_code=422, detail=str(e))
+    if updated is None:
+        raise conflict()
+    
+    return {"success": True, "version": updated["version"]}
+
+# Fill plan: derived values computed once per profile version (and day, for years of experience)
+_fill_plan_cache = {}
+
+def get_fill_plan(profile: dict):
+    key = (profile.get("version", 0), profile.get("updated_at"), date.today().isoformat())
+    cached = _fill_plan_cache.get("entry")
+    if cached and cached["key"] == key:
+        return cached
+    plan = build_fill_plan(profile)
+    entry = {"key": key, "hash": plan_hash(plan), "plan": plan}
+    _fill_plan_cache["entry"] = entry
+    return entry
+
+@app.get("/api/profile/fill-plan")
+async def get_profile_fill_plan(request: Request):
+    """Precomputed fill values for the extension, revalidated with ETag"""
+    profile = profiles_collection.find_one({"type": "main_profile"}) or DEFAULT_PROFILE
+    entry = get_fill_plan(profile)
+    etag = f'"{entry["hash"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {"version_hash": entry["hash"], "profile_version": entry["key"][0], "plan": entry["plan"]},
+        headers=headers
     )
-    return {"success": True, "message": "Profile updated successfully"}
 
 @app.post("/api/profile/reset")
 async def reset_profile():
@@ -405,20 +743,23 @@ async def reset_profile():
     profile_data = {**DEFAULT_PROFILE, "type": "main_profile", "updated_at": datetime.utcnow().isoformat()}
     profiles_collection.update_one(
         {"type": "main_profile"},
-        {"$set": profile_data},
+        {"$set": profile_data, "$inc": {"version": 1}},
         upsert=True
     )
     return {"success": True, "message": "Profile reset to default"}
 
 # Settings Routes
-@app.get("/api/settings")
-async def get_settings():
-    """Get extension settings"""
+def load_settings():
     settings = settings_collection.find_one({"type": "main_settings"})
     if settings:
         return serialize_doc(settings)
     return {"_id": "default", **DEFAULT_SETTINGS}
 
+@app.get("/api/settings")
+async def get_settings():
+    """Get extension settings"""
+    return load_settings()
+
 @app.put("/api/settings")
 async def update_settings(settings: Settings):
     """Update extension settings"""
@@ -434,97 +775,331 @@ async def update_settings(settings: Settings):
     return {"success": True, "message": "Settings updated successfully"}
 
 # Applications Routes
-@app.get("/api/applications")
-async def get_applications(
+def list_applications(
     limit: int = 50,
     skip: int = 0,
     status: Optional[str] = None,
-    platform: Optional[str] = None
+    platform: Optional[str] = None,
+    include_archived: bool = False
 ):
-    """Get job applications with optional filters"""
     query = {}
     if status:
         query["status"] = status
     if platform:
         query["platform"] = platform
     
-    applications = list(
-        applications_collection.find(query)
-        .sort("applied_date", -1)
-        .skip(skip)
-        .limit(limit)
-    )
-    
-    total = applications_collection.count_documents(query)
+    if not include_archived:
+        with phase("mongo.find"):
+            applications = list(
+                applications_collection.find(query, INTERNAL_APPLICATION_FIELDS)
+                .sort("applied_date", -1)
+                .skip(skip)
+                .limit(limit)
+            )
+        with phase("mongo.count"):
+            total = applications_collection.count_documents(query)
+    else:
+        # Both tiers are sorted by applied_date: take the first skip+limit of each, merge, then page
+        # (limit=0 means no limit, as with the hot-only query)
+        window = skip + limit if limit else 0
+        with phase("mongo.find"):
+            applications = list(
+                applications_collection.find(query, INTERNAL_APPLICATION_FIELDS)
+                .sort("applied_date", -1)
+                .limit(window)
+            )
+        with phase("mongo.archive"):
+            for doc in archive_collection.find(query).sort("applied_date", -1).limit(window):
+                doc["archived"] = True
+                applications.append(doc)
+            applications.sort(key=lambda a: a.get("applied_date", ""), reverse=True)
+            applications = applications[skip:skip + limit] if limit else applications[skip:]
+        with phase("mongo.count"):
+            total = applications_collection.count_documents(query) + archive_collection.count_documents(query)
     
+    with phase("serialize"):
+        page = [serialize_doc(app) for app in applications]
     return {
-        "applications": [serialize_doc(app) for app in applications],
+        "applications": page,
         "total": total,
         "limit": limit,
         "skip": skip
     }
 
+@app.get("/api/applications")
+async def get_applications(
+    limit: int = 50,
+    skip: int = 0,
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    include_archived: bool = False
+):
+    """Get job applications with optional filters"""
+    return list_applications(limit, skip, status, platform, include_archived)
+
+def find_duplicates(company: str, position: str, job_url: Optional[str] = None, exclude_id=None, limit: int = 10):
+    """Exact job_url matches via url_hash; near matches at the same company (company_key) by title similarity.
+
+    Both tiers are searched; archived matches are flagged with archived: True.
+    Near-match candidates are narrowed by company_key (plus the LSH bands on
+    the hot tier) and every candidate is scored before the result is cut to limit.
+    """
+    signature = signature_fields(company, position, job_url)
+    projection = {"company": 1, "position": 1, "job_url": 1, "platform": 1, "status": 1, "applied_date": 1}
+    base_query = {"_id": {"$ne": exclude_id}} if exclude_id else {}
+    tiers = [(applications_collection, False), (archive_collection, True)]
+    candidates = {}
+
+    if signature["url_hash"]:
+        for collection, archived in tiers:
+            for doc in collection.find({**base_query, "url_hash": signature["url_hash"]}, projection).limit(limit):
+                doc = serialize_doc(doc)
+                candidates[doc["_id"]] = {**doc, "match": "exact_url", "similarity": 1.0, "archived": archived}
+
+    if signature["company_key"]:
+        near_queries = [
+            (applications_collection, {"company_key": signature["company_key"], "dup_bands": {"$in": signature["dup_bands"]}}, False),
+            (archive_collection, {"company_key": signature["company_key"]}, True),
+        ]
+        for collection, query, archived in near_queries:
+            for doc in collection.find({**base_query, **query}, projection):
+                doc = serialize_doc(doc)
+                if doc["_id"] in candidates:
+                    continue
+                similarity = is_near_duplicate(company, position, doc.get("company"), doc.get("position"))
+                if similarity is not None:
+                    candidates[doc["_id"]] = {**doc, "match": "similar", "similarity": round(similarity, 3), "archived": archived}
+
+    return sorted(candidates.values(), key=lambda c: c["similarity"], reverse=True)[:limit]
+
+@app.post("/api/applications/check-duplicates")
+async def check_duplicates(request: DuplicateCheckRequest):
+    """Find existing applications that look like the same job"""
+    start = time.perf_counter()
+    duplicates = find_duplicates(request.company, request.position, request.job_url)
+    return {
+        "duplicates": duplicates,
+        "check_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
 @app.post("/api/applications")
-async def create_application(application: JobApplication):
-    """Log a new job application"""
+async def create_application(application: JobApplication, on_duplicate: str = "allow"):
+    """Log a new job application.
+
+    on_duplicate: allow (insert and report candidates), skip (return the
+    existing application instead of inserting, only when it has the same
+    job_url) or reject (409 with candidates).
+    """
+    if on_duplicate not in ("allow", "skip", "reject"):
+        raise HTTPException(status_code=400, detail="on_duplicate must be allow, skip or reject")
+
+    duplicates = find_duplicates(application.company, application.position, application.job_url)
+    # Only skip when it is surely the same posting (same URL); near matches are only reported
+    same_posting = [d for d in duplicates if d["match"] == "exact_url"]
+    if same_posting and on_duplicate == "skip":
+        return {"success": True, "application": same_posting[0], "duplicates": duplicates, "skipped": True}
+    if duplicates and on_duplicate == "reject":
+        raise HTTPException(status_code=409, detail={"message": "Possible duplicate application", "duplicates": duplicates})
+
     app_data = application.model_dump()
     app_data["created_at"] = datetime.utcnow().isoformat()
+    app_data.update(signature_fields(application.company, application.position, application.job_url))
     
     result = applications_collection.insert_one(app_data)
     app_data["_id"] = str(result.inserted_id)
+    app_data.pop("dup_bands", None)
+    record_status_events([(result.inserted_id, None, app_data["status"])], app_data["created_at"], "create")
+    application_snapshot.upsert(app_data)
+    publish_application_event("created", app_data["_id"], None, app_data, app_data)
     
-    return {"success": True, "application": app_data}
+    return {"success": True, "application": app_data, "duplicates": duplicates}
 
 @app.put("/api/applications/{app_id}")
 async def update_application(app_id: str, application: JobApplication):
     """Update a job application"""
     app_data = application.model_dump()
     app_data["updated_at"] = datetime.utcnow().isoformat()
+    app_data.update(signature_fields(application.company, application.position, application.job_url))
     
-    result = applications_collection.update_one(
-        {"_id": ObjectId(app_id)},
-        {"$set": app_data}
+    # status_changed_at moves only when the status does, in the same write
+    set_stage = {
+        **{k: {"$literal": v} for k, v in app_data.items()},
+        "status_changed_at": {"$cond": [
+            {"$ne": ["$status", app_data["status"]]}, app_data["updated_at"], "$status_changed_at"
+        ]},
+    }
+    previous = applications_collection.find_one_and_update(
+        {"_id": parse_object_id(app_id)},
+        [{"$set": set_stage}],
+        projection=SNAPSHOT_FIELDS,
+        return_document=ReturnDocument.BEFORE
     )
     
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    if previous.get("status") != app_data["status"]:
+        app_data["status_changed_at"] = app_data["updated_at"]
+        record_status_events([(previous["_id"], previous.get("status"), app_data["status"])], app_data["updated_at"], "update")
+    application_snapshot.upsert({**previous, **app_data})
+    app_data.pop("dup_bands", None)
+    publish_application_event("updated", app_id, previous, {**previous, **app_data}, {**app_data, "_id": app_id})
+    
     return {"success": True, "message": "Application updated"}
 
+# Status transitions: small in-place update + append-only history event,
+# also applied to the in-memory history aggregates
+status_history = StatusHistory()
+
+def record_status_events(transitions, at: str, source: str, note: Optional[str] = None):
+    """transitions: [(application ObjectId, from_status, to_status)]"""
+    events = [
+        {"application_id": app_oid, "from_status": from_status, "to_status": to_status, "at": at, "source": source, "note": note}
+        for app_oid, from_status, to_status in transitions
+    ]
+    if events:
+        status_history_collection.insert_many(events, ordered=False)
+        if status_history.loaded:
+            status_history.record(events)
+
+def publish_application_event(kind: str, app_id, before: Optional[dict], after: Optional[dict], application: Optional[dict] = None):
+    """Push a created/updated/deleted event with its stats delta to live dashboards"""
+    data = {"id": str(app_id), "delta": stats_delta(before, after, APPLICATION_STATUSES, STATS_PLATFORMS)}
+    if application is not None:
+        data["application"] = serialize_doc(dict(application))
+    live_events.publish(f"application.{kind}", data)
+
+def validate_status(status: str):
+    if status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=422, detail=f"status must be one of {APPLICATION_STATUSES}")
+
+def parse_object_id(app_id: str) -> ObjectId:
+    try:
+        return ObjectId(app_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid application id: {app_id}")
+
+@app.post("/api/applications/status")
+async def bulk_transition_status(transition: BulkStatusTransition):
+    """Move several applications to a status (multi-select)"""
+    validate_status(transition.status)
+    oids = [parse_object_id(i) for i in transition.ids]
+    now = datetime.utcnow().isoformat()
+    
+    changes = {"status": transition.status, "status_changed_at": now, "updated_at": now}
+
+    def transition_many():
+        # Only applications actually changing status get an event
+        candidates = list(applications_collection.find(
+            {"_id": {"$in": oids}, "status": {"$ne": transition.status}},
+            SNAPSHOT_FIELDS
+        ))
+        if not candidates:
+            return [], []
+        # Compare-and-swap on the status we read, so from_status is exactly the value replaced;
+        # an application moved concurrently is left alone and gets no event
+        result = applications_collection.bulk_write(
+            [UpdateOne({"_id": doc["_id"], "status": doc.get("status")}, {"$set": changes}) for doc in candidates],
+            ordered=False
+        )
+        if result.modified_count == len(candidates):
+            return candidates, []
+        # The bulk result has no per-op counts: ours are the ones carrying this write's timestamp
+        written = {doc["_id"] for doc in applications_collection.find(
+            {"_id": {"$in": [doc["_id"] for doc in candidates]}, "status": transition.status, "status_changed_at": now},
+            {"_id": 1}
+        )}
+        return ([doc for doc in candidates if doc["_id"] in written],
+                [doc for doc in candidates if doc["_id"] not in written])
+
+    changing, conflicts = await asyncio.to_thread(transition_many)
+    if changing:
+        record_status_events(
+            [(doc["_id"], doc.get("status"), transition.status) for doc in changing], now, "bulk", transition.note
+        )
+        for doc in changing:
+            application_snapshot.upsert({**doc, **changes})
+            publish_application_event("updated", doc["_id"], doc, {**doc, **changes}, {"_id": doc["_id"], **changes})
+    
+    return {
+        "success": True,
+        "updated": len(changing),
+        "unchanged": len(oids) - len(changing),
+        # Changed by another client between the read and the write
+        "conflicts": [str(doc["_id"]) for doc in conflicts]
+    }
+
+@app.post("/api/applications/{app_id}/status")
+async def transition_status(app_id: str, transition: StatusTransition):
+    """Change one application's status without resending the document"""
+    validate_status(transition.status)
+    now = datetime.utcnow().isoformat()
+    app_oid = parse_object_id(app_id)
+    previous = applications_collection.find_one_and_update(
+        {"_id": app_oid, "status": {"$ne": transition.status}},
+        {"$set": {"status": transition.status, "status_changed_at": now, "updated_at": now}},
+        projection=SNAPSHOT_FIELDS,
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        if applications_collection.count_documents({"_id": app_oid}, limit=1) == 0:
+            raise HTTPException(status_code=404, detail="Application not found")
+        return {"success": True, "changed": False}
+    
+    record_status_events([(previous["_id"], previous.get("status"), transition.status)], now, "transition", transition.note)
+    changes = {"status": transition.status, "status_changed_at": now, "updated_at": now}
+    application_snapshot.upsert({**previous, **changes})
+    publish_application_event("updated", app_oid, previous, {**previous, **changes}, {"_id": app_oid, **changes})
+    return {"success": True, "changed": True, "from_status": previous.get("status"), "to_status": transition.status}
+
+@app.get("/api/applications/{app_id}/history")
+async def get_status_history(app_id: str):
+    """Status transitions for one application, oldest first"""
+    events = list(status_history_collection.find({"application_id": parse_object_id(app_id)}).sort("at", 1))
+    for event in events:
+        event["_id"] = str(event["_id"])
+        event["application_id"] = str(event["application_id"])
+    return {"history": events}
+
 @app.delete("/api/applications/{app_id}")
 async def delete_application(app_id: str):
     """Delete a job application"""
-    result = applications_collection.delete_one({"_id": ObjectId(app_id)})
+    previous = applications_collection.find_one_and_delete({"_id": parse_object_id(app_id)}, projection=SNAPSHOT_FIELDS)
     
-    if result.deleted_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Application not found")
+    application_snapshot.remove(app_id)
+    # Marks the application's history so analytics leave it out
+    record_status_events([(previous["_id"], previous.get("status"), DELETED_STATUS)], datetime.utcnow().isoformat(), "delete")
+    publish_application_event("deleted", app_id, previous, None)
     
     return {"success": True, "message": "Application deleted"}
 
-@app.get("/api/applications/stats")
-async def get_application_stats():
-    """Get application statistics"""
-    total = applications_collection.count_documents({})
+def compute_application_stats(include_archived: bool = False):
+    collections = [applications_collection, archive_collection] if include_archived else [applications_collection]
+
+    def count(query):
+        return sum(c.count_documents(query) for c in collections)
+
+    total = count({})
     
     # Status breakdown
-    statuses = ["Applied", "In Progress", "Interview", "Rejected", "Offer"]
     status_counts = {}
-    for status in statuses:
-        status_counts[status] = applications_collection.count_documents({"status": status})
+    for status in APPLICATION_STATUSES:
+        status_counts[status] = count({"status": status})
     
     # Platform breakdown
-    platforms = ["LinkedIn", "Indeed", "Greenhouse", "Lever", "Workday", "Glassdoor", "ZipRecruiter", "Other"]
     platform_counts = {}
-    for platform in platforms:
-        platform_counts[platform] = applications_collection.count_documents({"platform": platform})
+    for platform in STATS_PLATFORMS:
+        platform_counts[platform] = count({"platform": platform})
     
     # Weekly applications (last 7 days)
     week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-    weekly = applications_collection.count_documents({"applied_date": {"$gte": week_ago}})
+    weekly = count({"applied_date": {"$gte": week_ago}})
     
     # Today's applications
     today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
-    today_count = applications_collection.count_documents({"applied_date": {"$gte": today}})
+    today_count = count({"applied_date": {"$gte": today}})
     
     return {
         "total": total,
@@ -535,23 +1110,264 @@ async def get_application_stats():
         "success_rate": round((status_counts.get("Interview", 0) + status_counts.get("Offer", 0)) / max(total, 1) * 100, 1)
     }
 
+@app.get("/api/applications/stats")
+async def get_application_stats(include_archived: bool = False):
+    """Get application statistics"""
+    return compute_application_stats(include_archived)
+
+# Live dashboard updates: application events with stats deltas over Server-Sent Events
+live_events = EventBroker(buffer_size=int(os.environ.get("LIVE_EVENT_BUFFER", "1000")))
+
+@app.get("/api/events/applications")
+async def stream_application_events(http_request: Request, last_event_id: Optional[str] = None):
+    """Push application created/updated/deleted events (resumes from Last-Event-ID)"""
+    resume_from = http_request.headers.get("last-event-id") or last_event_id
+    return StreamingResponse(
+        event_stream(live_events, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/events/stats")
+async def get_event_stats():
+    """Connected dashboards, last event id and resume/resync counters"""
+    return live_events.snapshot()
+
+# Funnel analytics (served from the in-memory columnar snapshot)
+def load_status_history():
+    """Read the history once (in index order); later events are applied by record_status_events"""
+    status_history.load(
+        status_history_collection.find({}, {"_id": 0, "application_id": 1, "to_status": 1, "at": 1})
+        .sort([("application_id", 1), ("at", 1)])
+    )
+
+@app.get("/api/analytics/funnel")
+async def get_funnel_analytics():
+    """Status counts and per-platform conversion, with the funnel and time-in-status from history"""
+    if not application_snapshot.loaded:
+        await asyncio.to_thread(load_application_snapshot)
+    if not status_history.loaded:
+        await asyncio.to_thread(load_status_history)
+    start = time.perf_counter()
+    history = status_history.compute()
+    result = application_snapshot.compute()
+    return {
+        **result,
+        "funnel": history["funnel"],
+        "time_in_status": history["time_in_status"],
+        "compute_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+@app.get("/api/analytics/status-history")
+async def get_status_history_analytics():
+    """Funnel and time-in-status computed from the status history events"""
+    if not status_history.loaded:
+        await asyncio.to_thread(load_status_history)
+    start = time.perf_counter()
+    result = status_history.compute()
+    return {**result, "compute_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+@app.post("/api/analytics/refresh")
+async def refresh_analytics():
+    """Rebuild the analytics snapshot and history aggregates from the database"""
+    await asyncio.to_thread(load_application_snapshot)
+    await asyncio.to_thread(load_status_history)
+    return {"success": True, "total": application_snapshot.size}
+
+# Archival (hot/cold tiering)
+def archive_policy_query():
+    cutoff = (datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    return {"status": {"$in": ARCHIVE_STATUSES}, "applied_date": {"$lt": cutoff}, "pinned_hot": {"$ne": True}}
+
+def run_archival():
+    """Move documents matching the policy to the archive, in batches.
+
+    Copy-then-delete with upserts keyed on _id, so a run interrupted between
+    the two steps is completed by the next one. The delete re-checks the
+    policy and the updated_at that was copied, so an application edited in
+    between stays in the hot tier and its stale archive copy is dropped.
+    """
+    moved = 0
+    query = archive_policy_query()
+    while True:
+        batch = list(applications_collection.find(query, INTERNAL_APPLICATION_FIELDS).limit(ARCHIVE_BATCH_SIZE))
+        if not batch:
+            break
+        archived_at = datetime.utcnow().isoformat()
+        archive_collection.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": archived_at}, upsert=True) for doc in batch],
+            ordered=False
+        )
+        result = applications_collection.bulk_write(
+            [DeleteOne({**query, "_id": doc["_id"], "updated_at": doc.get("updated_at")}) for doc in batch],
+            ordered=False
+        )
+        if result.deleted_count < len(batch):
+            ids = [doc["_id"] for doc in batch]
+            kept = [doc["_id"] for doc in applications_collection.find({"_id": {"$in": ids}}, {"_id": 1})]
+            archive_collection.delete_many({"_id": {"$in": kept}})
+        moved += result.deleted_count
+    return moved
+
+def tier_stats():
+    def coll_stats(name):
+        try:
+            info = db.command("collStats", name)
+        except Exception:
+            return {"count": 0, "size_bytes": 0, "storage_bytes": 0}
+        return {"count": info.get("count", 0), "size_bytes": info.get("size", 0), "storage_bytes": info.get("storageSize", 0)}
+
+    hot, cold = coll_stats("applications"), coll_stats("applications_archive")
+    total_size = hot["size_bytes"] + cold["size_bytes"]
+    return {
+        "hot": hot,
+        "archive": cold,
+        "policy": {"statuses": ARCHIVE_STATUSES, "older_than_days": ARCHIVE_AFTER_DAYS, "interval_hours": ARCHIVE_INTERVAL_HOURS},
+        # Share of application data no longer in the default query path
+        "working_set_reduction_pct": round(cold["size_bytes"] / total_size * 100, 1) if total_size else 0.0
+    }
+
+async def archival_loop():
+    while True:
+        try:
+            moved = await asyncio.to_thread(run_archival)
+            if moved:
+                live_events.publish("resync", {"reason": "archived", "count": moved})
+        except Exception:
+            logger.exception("Archival run failed")
+        await asyncio.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
+
+@app.on_event("startup")
+async def start_archiver():
+    if ARCHIVE_INTERVAL_HOURS > 0:
+        app.state.archiver = asyncio.create_task(archival_loop())
+
+@app.post("/api/applications/archive/run")
+async def trigger_archival():
+    """Run the archival policy now"""
+    before = await asyncio.to_thread(tier_stats)
+    moved = await asyncio.to_thread(run_archival)
+    if moved:
+        live_events.publish("resync", {"reason": "archived", "count": moved})
+    return {"success": True, "archived": moved, "before": before, "after": await asyncio.to_thread(tier_stats)}
+
+@app.get("/api/applications/archive/stats")
+async def get_archive_stats():
+    """Hot/cold tier sizes and working-set reduction"""
+    return tier_stats()
+
+@app.post("/api/applications/{app_id}/unarchive")
+async def unarchive_application(app_id: str):
+    """Move an archived application back to the hot tier"""
+    doc = archive_collection.find_one({"_id": parse_object_id(app_id)})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Archived application not found")
+    doc.pop("archived_at", None)
+    # Keep a restored application out of the next archival run
+    doc["pinned_hot"] = True
+    doc.update(signature_fields(doc.get("company"), doc.get("position"), doc.get("job_url")))
+    applications_collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+    archive_collection.delete_one({"_id": doc["_id"]})
+    doc.pop("dup_bands", None)
+    publish_application_event("created", doc["_id"], None, doc, doc)
+    return {"success": True, "message": "Application restored"}
+
+# Bootstrap: everything the extension and dashboard need on startup in one round trip
+BOOTSTRAP_SECTIONS = ("profile", "settings", "stats", "recent")
+
+@app.get("/api/bootstrap")
+async def bootstrap(response: Response, recent_limit: int = 5, sections: Optional[str] = None):
+    """Get profile, settings, stats and recent applications in one response.
+
+    sections is a comma-separated subset of BOOTSTRAP_SECTIONS; only those
+    are read and returned (default: all of them).
+    """
+    wanted = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(BOOTSTRAP_SECTIONS)
+    unknown = [s for s in wanted if s not in BOOTSTRAP_SECTIONS]
+    if unknown or not wanted:
+        raise HTTPException(status_code=400, detail=f"sections must be a subset of {', '.join(BOOTSTRAP_SECTIONS)}")
+
+    loaders = {
+        "profile": lambda: asyncio.to_thread(load_profile),
+        "settings": lambda: asyncio.to_thread(load_settings),
+        "stats": lambda: asyncio.to_thread(compute_application_stats),
+        "recent": lambda: asyncio.to_thread(list_applications, recent_limit, 0),
+    }
+    names = [name for name in BOOTSTRAP_SECTIONS if name in wanted]
+    # Taken before the reads: live events up to this id are already in the snapshot
+    events_after = live_events.last_id
+    start = time.perf_counter()
+    results = await asyncio.gather(*(loaders[name]() for name in names))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.headers["Server-Timing"] = f"db;dur={elapsed_ms:.1f}"
+    body = dict(zip(names, results))
+    if "recent" in body:
+        body["recent_applications"] = body.pop("recent")["applications"]
+    if "stats" in body or "recent_applications" in body:
+        body["events_after"] = events_after
+    return body
+
 # AI Form Analysis
 @app.post("/api/ai/analyze-form")
-async def analyze_form(request: FormAnalysisRequest):
+async def analyze_form(request: FormAnalysisRequest, http_request: Request):
     """Use AI to analyze form fields and match with profile data"""
     
     # Get profile data
-    profile = profiles_collection.find_one({"type": "main_profile"})
+    with phase("mongo.profile"):
+        profile = profiles_collection.find_one({"type": "main_profile"})
     if not profile:
         profile = DEFAULT_PROFILE
     
-    # Build prompt for AI
-    fields_description = "\n".join([
-        f"- Field: {f.field_name}, Type: {f.field_type}, Label: {f.label or 'N/A'}, Placeholder: {f.placeholder or 'N/A'}"
-        for f in request.fields
-    ])
+    with phase("mongo.pregenerated"):
+        pregenerated = find_pregenerated_analysis(request, profile)
+    if pregenerated:
+        return pregenerated
+    
+    client_id, address = client_identity(http_request)
     
-    prompt = f"""You are an expert at matching job application form fields with candidate profile data.
+    async def admitted_analysis():
+        # One rate-limit token per request; every chunk's LLM call then takes its own capacity unit
+        ai_admission.admit(client_id, address)
+        return await run_form_analysis(request, profile, capacity=ai_admission.capacity)
+    
+    # Only the first caller is admitted and calls the LLM; identical callers wait on it
+    flight_key = f"{profile.get('version', 0)}:{fingerprint(request.model_dump())}"
+    try:
+        result, shared = await form_analysis_flights.do(flight_key, admitted_analysis, http_request.is_disconnected)
+        return {**result, "coalesced": True} if shared else result
+    except Disconnected:
+        # Client went away; nobody will read this
+        return Response(status_code=499)
+    except AdmissionRejected as rejected:
+        if AI_OVERLOAD_RESPONSE == "reject":
+            ai_overload_counters["rejected_429"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "AI analysis is busy, retry later", "reason": rejected.reason},
+                headers={"Retry-After": str(max(1, int(rejected.retry_after + 0.999)))}
+            )
+        ai_overload_counters["fallback_served"] += 1
+        result = await fallback_form_analysis(request, profile)
+        result["admission"] = rejected.reason
+        return result
+
+# Large forms are analyzed in size-bounded chunks, concurrently
+AI_CHUNK_MAX_FIELDS = int(os.environ.get("AI_CHUNK_MAX_FIELDS", "12"))
+AI_CHUNK_MAX_CHARS = int(os.environ.get("AI_CHUNK_MAX_CHARS", "3000"))
+AI_CHUNK_CONCURRENCY = int(os.environ.get("AI_CHUNK_CONCURRENCY", "4"))
+AI_CHUNK_RETRIES = int(os.environ.get("AI_CHUNK_RETRIES", "1"))
+MAX_OPTIONS_IN_PROMPT = 25
+
+def describe_field(f: FormField) -> str:
+    line = f"- Field: {f.field_name}, Type: {f.field_type}, Label: {f.label or 'N/A'}, Placeholder: {f.placeholder or 'N/A'}"
+    if f.options:
+        shown = f.options[:MAX_OPTIONS_IN_PROMPT]
+        more = f" (+{len(f.options) - len(shown)} more)" if len(f.options) > len(shown) else ""
+        line += f", Options: {' | '.join(shown)}{more}"
+    return line
+
+def build_analysis_prompt(request: FormAnalysisRequest, profile: dict, fields_description: str) -> str:
+    return f"""You are an expert at matching job application form fields with candidate profile data.
 
 Candidate Profile:
 - Name: {profile.get('personal_info', {}).get('full_name', 'N/A')}
@@ -578,41 +1394,122 @@ For each form field, return a JSON object with:
 
 Return ONLY a valid JSON array, no other text."""
 
-    try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that matches form fields with profile data. Always return valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
-        )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # Try to parse JSON
-        if result_text.startswith("```json"):
-            result_text = result_text[7:]
-        if result_text.startswith("```"):
-            result_text = result_text[3:]
-        if result_text.endswith("```"):
-            result_text = result_text[:-3]
-        
-        field_mappings = json.loads(result_text)
-        
-        return {
-            "success": True,
-            "field_mappings": field_mappings,
-            "profile_used": {
-                "name": profile.get('personal_info', {}).get('full_name'),
-                "email": profile.get('personal_info', {}).get('email')
-            }
-        }
-        
-    except Exception as e:
+def parse_mappings(result_text: str) -> list:
+    # Try to parse JSON
+    if result_text.startswith("```json"):
+        result_text = result_text[7:]
+    if result_text.startswith("```"):
+        result_text = result_text[3:]
+    if result_text.endswith("```"):
+        result_text = result_text[:-3]
+    
+    field_mappings = json.loads(result_text)
+    if not isinstance(field_mappings, list):
+        raise ValueError("Expected a JSON array of field mappings")
+    return field_mappings
+
+async def run_form_analysis(request: FormAnalysisRequest, profile: dict, capacity=None):
+    """LLM analysis with rule-based fallback on any provider/parse error.
+
+    Fields are split into chunks analyzed concurrently; a chunk that still
+    fails after its retries falls back to rule-based matching for just its
+    fields, and results are merged back in the original field order.
+    capacity (e.g. ai_admission.capacity) is held around each LLM call, so
+    upstream concurrency stays within the admission limit whatever the
+    chunk count. If every chunk was refused admission, AdmissionRejected is
+    raised for the caller to handle.
+    """
+    profile_used = {
+        "name": profile.get('personal_info', {}).get('full_name'),
+        "email": profile.get('personal_info', {}).get('email')
+    }
+    chunks = chunk_items(request.fields, lambda f: len(describe_field(f)), AI_CHUNK_MAX_FIELDS, AI_CHUNK_MAX_CHARS)
+    if not chunks:
+        return {"success": True, "field_mappings": [], "profile_used": profile_used, "provider": None,
+                "hedged": False, "chunks": 0, "failed_chunks": 0, "fallback_used": False, "fallback_fields": []}
+    with phase("mongo.settings"):
+        settings = settings_collection.find_one({"type": "main_settings"}) or DEFAULT_SETTINGS
+    providers = get_llm_providers(settings)
+    routes = []
+    
+    async def analyze_chunk(fields):
+        with phase("prompt"):
+            fields_description = "\n".join(describe_field(f) for f in fields)
+            prompt = build_analysis_prompt(request, profile, fields_description)
+        async with capacity() if capacity else contextlib.nullcontext():
+            with phase("llm"):
+                routed = await llm_router.complete(
+                    providers,
+                    [
+                        {"role": "system", "content": "You are a helpful assistant that matches form fields with profile data. Always return valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    preferred=preferred_provider(settings),
+                    hedge_delay=LLM_HEDGE_DELAY_MS / 1000 if LLM_HEDGE_DELAY_MS > 0 else None,
+                    temperature=0.3,
+                    # ~120 output tokens per field, capped at the previous single-call limit
+                    max_tokens=min(2000, 200 + 120 * len(fields))
+                )
+        with phase("parse"):
+            mappings = parse_mappings(routed["text"])
+        routes.append(routed)
+        return mappings
+    
+    results = await run_chunks(chunks, analyze_chunk, AI_CHUNK_CONCURRENCY, AI_CHUNK_RETRIES, no_retry=(AdmissionRejected,))
+    
+    errors = [error for mappings, error in results if error is not None]
+    if errors and len(errors) == len(chunks):
+        if all(isinstance(e, AdmissionRejected) for e in errors):
+            raise errors[0]
         # Fallback to rule-based matching
         return await fallback_form_analysis(request, profile)
+    
+    by_name = {}
+    for mappings, error in results:
+        for mapping in mappings or []:
+            if isinstance(mapping, dict) and mapping.get("field_name") is not None:
+                by_name.setdefault(mapping["field_name"], mapping)
+    
+    # Fields a failed chunk (or the model) left out get rule-based values
+    missing = [f for f in request.fields if f.field_name not in by_name]
+    if missing:
+        fallback = await fallback_form_analysis(request.model_copy(update={"fields": missing}), profile)
+        for mapping in fallback["field_mappings"]:
+            by_name.setdefault(mapping["field_name"], mapping)
+    
+    return {
+        "success": True,
+        "field_mappings": [by_name[f.field_name] for f in request.fields],
+        "profile_used": profile_used,
+        "provider": routes[0]["provider"] if routes else None,
+        "hedged": any(r["hedged"] for r in routes),
+        "chunks": len(chunks),
+        "failed_chunks": len(errors),
+        "fallback_used": bool(missing),
+        # Fields answered by rule-based matching, so a retry can redo just these
+        "fallback_fields": [f.field_name for f in missing]
+    }
+
+@app.get("/api/ai/providers")
+async def get_ai_providers():
+    """Rolling latency and error stats for each LLM provider"""
+    settings = settings_collection.find_one({"type": "main_settings"}) or DEFAULT_SETTINGS
+    return {
+        "preferred": preferred_provider(settings),
+        "configured": [p.name for p in get_llm_providers(settings)],
+        "hedge_delay_ms": LLM_HEDGE_DELAY_MS,
+        "stats": llm_router.snapshot()
+    }
+
+@app.get("/api/ai/admission")
+async def get_ai_admission():
+    """Queue depth, in-flight count, rejection and coalescing counters for AI analysis"""
+    return {
+        **ai_admission.snapshot(),
+        **ai_overload_counters,
+        "overload_response": AI_OVERLOAD_RESPONSE,
+        "coalescing": form_analysis_flights.snapshot()
+    }
 
 async def fallback_form_analysis(request: FormAnalysisRequest, profile: dict):
     """Rule-based fallback for form field matching"""
@@ -631,11 +1528,12 @@ async def fallback_form_analysis(request: FormAnalysisRequest, profile: dict):
         'website': ['website', 'portfolio', 'personal_website', 'url']
     }
     
+    plan = get_fill_plan(profile)["plan"]
     profile_values = {
-        'name': personal.get('full_name', ''),
-        'first_name': personal.get('full_name', '').split()[0] if personal.get('full_name') else '',
-        'last_name': ' '.join(personal.get('full_name', '').split()[1:]) if personal.get('full_name') else '',
-        'email': personal.get('email', ''),
+        'name': plan['name']['full'] or '',
+        'first_name': plan['name']['first'],
+        'last_name': plan['name']['last_full'],
+        'email': plan['email'] or '',
         'phone': personal.get('phone', ''),
         'linkedin': personal.get('linkedin', ''),
         'location': personal.get('location', ''),
@@ -673,14 +1571,200 @@ async def fallback_form_analysis(request: FormAnalysisRequest, profile: dict):
             "name": personal.get('full_name'),
             "email": personal.get('email')
         },
-        "fallback_used": True
+        "fallback_used": True,
+        "fallback_fields": [f.field_name for f in request.fields]
     }
 
+# Saved jobs: AI work pre-generated in the background, off the form-filling critical path
+PREGEN_MAX_ATTEMPTS = 3
+
+def saved_job_key(job_url: Optional[str], job_title: str, company: str) -> str:
+    return url_hash(job_url) or hashlib.sha1(f"{company.lower()}|{job_title.lower()}".encode()).hexdigest()
+
+async def generate_long_form_answer(question: str, job_title: str, company: str, profile: dict, settings: dict) -> str:
+    personal = profile.get('personal_info', {})
+    recent = (profile.get('work_experience') or [{}])[0]
+    prompt = f"""Write a concise, first-person answer (under 150 words) to this job application question.
+
+Question: {question}
+Job: {job_title} at {company}
+
+Candidate: {personal.get('full_name', 'N/A')}
+Summary: {profile.get('summary', 'N/A')}
+Most Recent Job: {recent.get('title', 'N/A')} at {recent.get('company', 'N/A')}
+Skills: {', '.join(profile.get('skills', [])[:15])}
+
+Return only the answer text."""
+    async with ai_admission.capacity():
+        routed = await llm_router.complete(
+            get_llm_providers(settings),
+            [{"role": "user", "content": prompt}],
+            preferred=preferred_provider(settings),
+            temperature=0.5,
+            max_tokens=400
+        )
+    return routed["text"]
+
+async def pregenerate_job(job_key: str, payload: dict, attempt: int):
+    """Worker handler; finished parts are kept on the payload so a retry only redoes what failed"""
+    try:
+        profile = await asyncio.to_thread(profiles_collection.find_one, {"type": "main_profile"}) or DEFAULT_PROFILE
+        settings = await asyncio.to_thread(settings_collection.find_one, {"type": "main_settings"}) or DEFAULT_SETTINGS
+        job = payload["job"]
+        
+        if job["fields"] and "analysis" not in payload:
+            # LLM mappings from earlier attempts are kept; only fields that fell back are re-analyzed
+            analyzed = payload.setdefault("mappings", {})
+            pending = [f for f in job["fields"] if f["field_name"] not in analyzed]
+            analysis = {"success": True, "field_mappings": []}
+            if pending:
+                # Background work shares the global cap with interactive analysis (provider quotas)
+                analysis = await run_form_analysis(
+                    FormAnalysisRequest(fields=pending, job_title=job["job_title"], company=job["company"]),
+                    profile,
+                    capacity=ai_admission.capacity
+                )
+            fell_back = set(analysis.get("fallback_fields", []))
+            for mapping in analysis["field_mappings"]:
+                if mapping["field_name"] not in fell_back:
+                    analyzed[mapping["field_name"]] = mapping
+            if fell_back and attempt < PREGEN_MAX_ATTEMPTS:
+                raise RuntimeError(f"LLM analysis failed for {len(fell_back)} of {len(job['fields'])} fields")
+            by_name = {**{m["field_name"]: m for m in analysis["field_mappings"]}, **analyzed}
+            payload["analysis"] = {
+                **analysis,
+                "field_mappings": [by_name[f["field_name"]] for f in job["fields"]],
+                "fallback_used": bool(fell_back),
+                "fallback_fields": sorted(fell_back)
+            }
+        
+        answers = payload.setdefault("answers", {})
+        for question in job["long_form_questions"]:
+            if question not in answers:
+                answers[question] = await generate_long_form_answer(question, job["job_title"], job["company"], profile, settings)
+        
+        await asyncio.to_thread(
+            saved_jobs_collection.update_one,
+            {"job_key": job_key},
+            {"$set": {
+                "status": "ready",
+                "analysis": payload.get("analysis"),
+                "answers": [{"question": q, "answer": a} for q, a in answers.items()],
+                "profile_version": profile.get("version", 0),
+                "attempts": attempt,
+                "error": None,
+                "completed_at": datetime.utcnow().isoformat()
+            }}
+        )
+    except Exception as e:
+        status = "failed" if attempt >= PREGEN_MAX_ATTEMPTS else "retrying"
+        await asyncio.to_thread(
+            saved_jobs_collection.update_one,
+            {"job_key": job_key},
+            {"$set": {"status": status, "attempts": attempt, "error": str(e)}}
+        )
+        raise
+
+pregen_queue = WorkQueue(
+    pregenerate_job,
+    workers=int(os.environ.get("PREGEN_WORKERS", "2")),
+    maxsize=int(os.environ.get("PREGEN_QUEUE_SIZE", "100")),
+    max_attempts=PREGEN_MAX_ATTEMPTS
+)
+
+@app.on_event("startup")
+async def start_pregen_queue():
+    await pregen_queue.start()
+    # Resume work accepted before a restart
+    pending = await asyncio.to_thread(
+        lambda: list(saved_jobs_collection.find({"status": {"$in": ["queued", "running", "retrying"]}}))
+    )
+    for doc in pending:
+        try:
+            pregen_queue.submit(doc["job_key"], {"job": doc["job"]}, doc.get("priority", 5))
+        except QueueFull:
+            break
+
+@app.on_event("shutdown")
+async def stop_pregen_queue():
+    await pregen_queue.stop()
+    for provider in _provider_cache.values():
+        await provider.aclose()
+
+def find_pregenerated_analysis(request: FormAnalysisRequest, profile: dict):
+    """Ready analysis for this job URL and profile version with an LLM mapping for every requested field.
+
+    Rule-based fallback mappings (left after the last pre-generation attempt)
+    are not served; the request is analyzed live instead.
+    """
+    key = url_hash(request.job_url)
+    if not key:
+        return None
+    doc = saved_jobs_collection.find_one({"job_key": key, "status": "ready"}, {"analysis": 1, "profile_version": 1})
+    if not doc or not doc.get("analysis") or doc.get("profile_version", 0) != profile.get("version", 0):
+        return None
+    fell_back = set(doc["analysis"].get("fallback_fields", []))
+    mappings = {m.get("field_name"): m for m in doc["analysis"].get("field_mappings", [])
+                if m.get("field_name") not in fell_back}
+    if not all(f.field_name in mappings for f in request.fields):
+        return None
+    return {**doc["analysis"], "field_mappings": [mappings[f.field_name] for f in request.fields],
+            "fallback_used": False, "fallback_fields": [], "pregenerated": True}
+
+@app.post("/api/jobs/saved")
+async def save_job(job: SavedJob):
+    """Save/bookmark a job and queue AI pre-generation for it"""
+    job_key = saved_job_key(job.job_url, job.job_title, job.company)
+    job_data = job.model_dump()
+    # Saved again with different fields/questions: rerun with the new input (after the current attempt)
+    active = pregen_queue.jobs.get(job_key)
+    changed = active is not None and active.payload.get("job") != job_data
+    try:
+        state = pregen_queue.submit(job_key, {"job": job_data}, job.priority, replace=changed)
+    except QueueFull:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Pre-generation queue is full, retry later"},
+            headers={"Retry-After": "30"}
+        )
+    # Written without yielding to the loop, so a worker cannot finish (and be overwritten) first
+    saved_jobs_collection.update_one(
+        {"job_key": job_key},
+        {
+            "$set": {"job": job_data, "priority": job.priority, "status": state.status},
+            "$setOnInsert": {"job_key": job_key, "created_at": datetime.utcnow().isoformat()}
+        },
+        upsert=True
+    )
+    return {"success": True, "job_key": job_key, "status": state.status}
+
+@app.get("/api/jobs/saved/{job_key}")
+async def get_saved_job(job_key: str):
+    """Status and (when ready) pre-generated results for a saved job"""
+    doc = saved_jobs_collection.find_one({"job_key": job_key})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Saved job not found")
+    doc.pop("_id", None)
+    return doc
+
+@app.get("/api/jobs/pregenerated")
+async def get_pregenerated(job_url: str):
+    """Look up pre-generated results by job URL"""
+    return await get_saved_job(url_hash(job_url) or "")
+
+@app.get("/api/jobs/queue")
+async def get_pregen_queue_status():
+    """Pre-generation queue depth, workers and counters"""
+    return pregen_queue.snapshot()
+
 # Export endpoint for Excel data
 @app.get("/api/applications/export")
-async def export_applications():
+async def export_applications(include_archived: bool = False):
     """Get all applications in a format suitable for Excel export"""
-    applications = list(applications_collection.find().sort("applied_date", -1))
+    applications = list(applications_collection.find({}, INTERNAL_APPLICATION_FIELDS).sort("applied_date", -1))
+    if include_archived:
+        applications.extend(archive_collection.find().sort("applied_date", -1))
+        applications.sort(key=lambda a: a.get("applied_date", ""), reverse=True)
     
     export_data = []
     for app in applications:
@@ -698,18 +1782,84 @@ async def export_applications():
     
     return {"data": export_data, "count": len(export_data)}
 
+# Request profiling captures (mounted only when PROFILE_ADMIN_TOKEN is set: they expose stacks)
+def require_profile_access(http_request: Request):
+    supplied = http_request.headers.get("x-profile", "").encode()
+    if not PROFILE_ADMIN_TOKEN or not hmac.compare_digest(supplied, PROFILE_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Profile access requires the X-Profile admin token")
+
+profile_routes = APIRouter(prefix="/api/debug/profiles", dependencies=[Depends(require_profile_access)])
+
+def get_capture(profile_id: str):
+    capture = profile_store.get(profile_id)
+    if not capture:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return capture
+
+@profile_routes.get("")
+async def list_profiles():
+    """Recent request profiles, newest first"""
+    return {
+        "enabled": bool(PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE > 0),
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "profiles": profile_store.list()
+    }
+
+@profile_routes.get("/{profile_id}")
+async def get_profile_capture(profile_id: str):
+    """Per-phase timing breakdown of one profiled request"""
+    return get_capture(profile_id).to_dict()
+
+@profile_routes.get("/{profile_id}/folded")
+async def get_profile_flamegraph(profile_id: str):
+    """Sampled stacks in collapsed format (flamegraph.pl, speedscope)"""
+    capture = get_capture(profile_id)
+    return PlainTextResponse(
+        capture.folded(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{capture.id}.folded"'}
+    )
+
+if PROFILE_ADMIN_TOKEN:
+    app.include_router(profile_routes)
+
+# Extension zip, built from chrome-extension/ and addressed by content hash
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+extension_bundle = ExtensionBundle(
+    source_dir=os.environ.get("EXTENSION_SOURCE_DIR", os.path.join(ROOT_DIR, "chrome-extension")),
+    output_dir=os.environ.get("EXTENSION_BUILD_DIR", os.path.join(tempfile.gettempdir(), "jobfill-extension")),
+    check_interval=float(os.environ.get("EXTENSION_CHECK_SECONDS", "2"))
+)
+EXTENSION_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+@app.on_event("startup")
+async def build_extension_bundle():
+    await asyncio.to_thread(extension_bundle.current, True)
+
+async def current_extension_bundle():
+    if not await asyncio.to_thread(extension_bundle.current):
+        raise HTTPException(status_code=404, detail="Extension file not found")
+    return extension_bundle
+
+@app.get("/api/extension/info")
+async def get_extension_info():
+    """Current extension build: content hash, size and versioned download URL"""
+    bundle = await current_extension_bundle()
+    return {**bundle.info(), "download_url": f"/api/extension/download/{bundle.short_hash}"}
+
 # Download extension endpoint
-@app.get("/api/extension/download")
-async def download_extension():
-    """Download the Chrome extension zip file"""
-    zip_path = "/app/chrome-extension.zip"
-    if os.path.exists(zip_path):
-        return FileResponse(
-            zip_path, 
-            media_type="application/zip",
-            filename="jobfill-chrome-extension.zip"
-        )
-    raise HTTPException(status_code=404, detail="Extension file not found")
+@app.api_route("/api/extension/download", methods=["GET", "HEAD"])
+async def download_extension(http_request: Request):
+    """Download the Chrome extension zip (revalidated via ETag on every use)"""
+    bundle = await current_extension_bundle()
+    return bundle_response(bundle, http_request.headers, "no-cache")
+
+@app.api_route("/api/extension/download/{content_hash}", methods=["GET", "HEAD"])
+async def download_extension_version(content_hash: str, http_request: Request):
+    """Download a specific build; the URL never changes content, so it is cached for a year"""
+    bundle = await current_extension_bundle()
+    if content_hash not in (bundle.short_hash, bundle.digest):
+        raise HTTPException(status_code=404, detail="Extension build not found")
+    return bundle_response(bundle, http_request.headers, EXTENSION_IMMUTABLE_CACHE)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,95 @@
+"""Single-flight coalescing: identical concurrent calls share one in-flight computation"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-like payload (key order and surrounding whitespace ignored)"""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    canonical = json.dumps(normalize(payload), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Disconnected(Exception):
+    """Raised to a waiter whose client went away before the result was ready"""
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """The first caller for a key starts the computation; later callers await it.
+
+    The computation runs as its own task, so one waiter going away does not
+    cancel it for the others. It is cancelled once every waiter has left
+    (cancelled, or reported disconnected via is_disconnected).
+    """
+
+    def __init__(self, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self._flights: Dict[str, _Flight] = {}
+        self.counters = {"leaders": 0, "coalesced": 0, "cancelled": 0, "abandoned_waiters": 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ):
+        """Returns (result, shared); shared is True when another caller started the work"""
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.counters["coalesced"] += 1
+        else:
+            flight = _Flight(asyncio.create_task(factory()))
+            self._flights[key] = flight
+            self.counters["leaders"] += 1
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            while True:
+                done, _ = await asyncio.wait({flight.task}, timeout=self.poll_interval if is_disconnected else None)
+                if done:
+                    return flight.task.result(), shared
+                if await is_disconnected():
+                    self._leave(key, flight)
+                    raise Disconnected(key)
+        except asyncio.CancelledError:
+            self._leave(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _leave(self, key: str, flight: _Flight):
+        self.counters["abandoned_waiters"] += 1
+        if flight.waiters == 1 and not flight.task.done():
+            # Last waiter gone: nobody needs the result any more
+            self.counters["cancelled"] += 1
+            self._forget(key, flight)
+            flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, "upstream_calls_saved": self.counters["coalesced"], **self.counters}
@@ -0,0 +1,120 @@
+"""
+Admission Control Tests
+Tests for: per-client token buckets, bounded queue, max wait
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionController, AdmissionRejected
+
+
+async def hold(controller, client_id, seconds):
+    async with controller.slot(client_id):
+        await asyncio.sleep(seconds)
+
+
+class TestRateLimit:
+    """Token bucket tests"""
+
+    def test_burst_then_rate_limited(self):
+        """Test a client is limited after its burst, with a Retry-After hint"""
+        controller = AdmissionController(client_rate=1, client_burst=3)
+
+        async def run():
+            for _ in range(3):
+                await hold(controller, "tab-storm", 0)
+            with pytest.raises(AdmissionRejected) as exc:
+                await hold(controller, "tab-storm", 0)
+            return exc.value
+
+        rejected = asyncio.run(run())
+        assert rejected.reason == "rate_limited"
+        assert 0 < rejected.retry_after <= 1
+        assert controller.counters["admitted"] == 3
+
+    def test_clients_are_independent(self):
+        """Test one client's burst does not limit another"""
+        controller = AdmissionController(client_rate=1, client_burst=1)
+
+        async def run():
+            await hold(controller, "a", 0)
+            await hold(controller, "b", 0)
+
+        asyncio.run(run())
+        assert controller.counters["rejected_rate_limited"] == 0
+
+    def test_rotating_ids_share_address_limit(self):
+        """Test fresh client ids from one address are still bounded by the address bucket"""
+        controller = AdmissionController(client_rate=0.001, client_burst=1, clients_per_address=2)
+        controller.admit("a", "10.0.0.1")
+        controller.admit("b", "10.0.0.1")
+        with pytest.raises(AdmissionRejected):
+            controller.admit("c", "10.0.0.1")
+        controller.admit("d", "10.0.0.2")
+
+    def test_rejection_consumes_no_tokens(self):
+        """Test a request rejected by one bucket does not drain the others"""
+        controller = AdmissionController(client_rate=0.001, client_burst=1, clients_per_address=1)
+        controller.admit("a", "10.0.0.1")
+        with pytest.raises(AdmissionRejected):
+            controller.admit("b", "10.0.0.1")
+        controller.admit("b", "10.0.0.2")
+
+
+class TestQueue:
+    """Global concurrency and queue tests"""
+
+    def test_queue_full_rejects_fast(self):
+        """Test requests beyond concurrency + queue are rejected immediately"""
+        controller = AdmissionController(max_concurrency=1, max_queue=1, max_wait=1, client_burst=100)
+
+        async def run():
+            tasks = [asyncio.create_task(hold(controller, f"c{i}", 0.1)) for i in range(3)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(run())
+        rejected = [r for r in results if isinstance(r, AdmissionRejected)]
+        assert [r.reason for r in rejected] == ["queue_full"]
+
+    def test_wait_times_out(self):
+        """Test a queued request gives up after max_wait"""
+        controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=0.05, client_burst=100)
+
+        async def run():
+            tasks = [asyncio.create_task(hold(controller, f"c{i}", 0.3)) for i in range(2)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert isinstance(results[1], AdmissionRejected)
+        assert results[1].reason == "timeout"
+        assert controller.snapshot()["queue_depth"] == 0
+
+    def test_one_token_many_capacity_units(self):
+        """Test a request admitted once still takes one capacity unit per upstream call"""
+        controller = AdmissionController(max_concurrency=2, max_queue=8, client_burst=1)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with controller.capacity():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.02)
+
+        async def run():
+            controller.admit("c1")
+            await asyncio.gather(*(call() for _ in range(5)))
+
+        asyncio.run(run())
+        assert peak == 2
+        assert controller.counters["admitted"] == 5
+        with pytest.raises(AdmissionRejected):
+            controller.admit("c1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+"""
+Analytics Snapshot Tests
+Tests for: status counts, per-platform conversion, history funnel and time-in-status, incremental writes
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import ApplicationSnapshot, StatusHistory, STATUSES, to_days, history_analytics
+
+
+def make_app(app_id, status, platform="LinkedIn", applied="2025-01-01", changed=None):
+    return {"_id": app_id, "status": status, "platform": platform, "applied_date": applied, "status_changed_at": changed}
+
+
+class TestFunnel:
+    """Funnel and conversion tests"""
+
+    def test_status_counts(self):
+        """Test current status counts over the snapshot"""
+        snapshot = ApplicationSnapshot()
+        snapshot.load([make_app("1", "Applied"), make_app("2", "Rejected"), make_app("3", "Rejected")])
+        counts = snapshot.compute()["status_counts"]
+        assert counts["Applied"] == 1 and counts["Rejected"] == 2
+
+    def test_platform_conversion(self):
+        """Test interview-or-offer rate per platform"""
+        snapshot = ApplicationSnapshot()
+        snapshot.load([
+            make_app("1", "Interview", "Indeed"),
+            make_app("2", "Applied", "Indeed"),
+            make_app("3", "Rejected", "Lever"),
+        ])
+        conversion = snapshot.compute()["platform_conversion"]
+        assert conversion["Indeed"]["rate"] == 0.5
+        assert conversion["Lever"]["rate"] == 0.0
+
+
+class TestIncrementalWrites:
+    """Snapshot maintenance tests"""
+
+    def test_upsert_and_remove(self):
+        """Test writes update the snapshot without a reload"""
+        snapshot = ApplicationSnapshot()
+        snapshot.load([make_app("1", "Applied"), make_app("2", "Applied")])
+        snapshot.upsert(make_app("1", "Offer"))
+        snapshot.remove("2")
+        snapshot.upsert(make_app("3", "Rejected"))
+
+        counts = snapshot.compute()["status_counts"]
+        assert counts["Offer"] == 1
+        assert counts["Applied"] == 0
+        assert counts["Rejected"] == 1
+        assert snapshot.size == 2
+
+    def test_100k_applications_in_milliseconds(self):
+        """Test a full computation over 100k rows stays interactive"""
+        snapshot = ApplicationSnapshot()
+        snapshot.load(
+            make_app(str(i), STATUSES[i % len(STATUSES)], ["LinkedIn", "Indeed", "Lever"][i % 3],
+                     f"2025-{1 + i % 12:02d}-01", f"2025-{1 + i % 12:02d}-15")
+            for i in range(100000)
+        )
+        start = time.perf_counter()
+        result = snapshot.compute()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert result["total"] == 100000
+        assert elapsed_ms < 250
+
+
+class TestHistoryAnalytics:
+    """Status-history based funnel and durations"""
+
+    def test_furthest_stage_counts_after_rejection(self):
+        """Test Interview -> Rejected still counts as reaching Interview"""
+        events = [
+            {"application_id": "a", "to_status": "Applied", "at": "2025-01-01"},
+            {"application_id": "a", "to_status": "Interview", "at": "2025-01-05"},
+            {"application_id": "a", "to_status": "Rejected", "at": "2025-01-15"},
+            {"application_id": "b", "to_status": "Applied", "at": "2025-01-02"},
+        ]
+        result = history_analytics(events, now=to_days("2025-01-20"))
+        funnel = {f["stage"]: f["reached"] for f in result["funnel"]}
+        assert funnel == {"Applied": 2, "In Progress": 1, "Interview": 1, "Offer": 0}
+
+    def test_time_in_status_uses_next_event(self):
+        """Test each status lasts until the next transition (or now)"""
+        events = [
+            {"application_id": "a", "to_status": "Applied", "at": "2025-01-01"},
+            {"application_id": "a", "to_status": "Interview", "at": "2025-01-05"},
+        ]
+        result = history_analytics(events, now=to_days("2025-01-15"))
+        assert result["time_in_status"]["Applied"]["days_in_status"]["p50"] == 4.0
+        assert result["time_in_status"]["Interview"]["days_in_status"]["p50"] == 10.0
+
+    def test_deleted_applications_excluded(self):
+        """Test an application with a Deleted event no longer counts"""
+        events = [
+            {"application_id": "a", "to_status": "Applied", "at": "2025-01-01"},
+            {"application_id": "a", "to_status": "Deleted", "at": "2025-01-03"},
+            {"application_id": "b", "to_status": "Applied", "at": "2025-01-02"},
+        ]
+        result = history_analytics(events, now=to_days("2025-01-10"))
+        assert result["applications"] == 1
+        assert result["events"] == 1
+
+
+class TestStatusHistory:
+    """Incrementally maintained history aggregates"""
+
+    def test_record_matches_full_load(self):
+        """Test events applied one by one give the same result as loading them all"""
+        events = [
+            {"application_id": "a", "to_status": "Applied", "at": "2025-01-01"},
+            {"application_id": "b", "to_status": "Applied", "at": "2025-01-02"},
+            {"application_id": "a", "to_status": "Interview", "at": "2025-01-05"},
+            {"application_id": "b", "to_status": "Deleted", "at": "2025-01-06"},
+            {"application_id": "a", "to_status": "Rejected", "at": "2025-01-09"},
+        ]
+        now = to_days("2025-01-20")
+        history = StatusHistory()
+        history.load(events[:2])
+        history.record(events[2:])
+        assert history.compute(now) == history_analytics(events, now=now)
+        assert history.compute(now)["applications"] == 1
+
+    def test_100k_applications_in_milliseconds(self):
+        """Test funnel and time-in-status over 150k events stay interactive"""
+        history = StatusHistory()
+        history.load(
+            {"application_id": str(i), "to_status": "Applied", "at": f"2025-{1 + i % 12:02d}-01"}
+            for i in range(100000)
+        )
+        history.record(
+            {"application_id": str(i), "to_status": STATUSES[1 + i % 4], "at": "2025-12-20"}
+            for i in range(0, 100000, 2)
+        )
+        start = time.perf_counter()
+        result = history.compute()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert result["applications"] == 100000
+        assert result["events"] == 150000
+        assert elapsed_ms < 250
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
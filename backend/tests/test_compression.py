@@ -0,0 +1,64 @@
+"""
+Response Compression Tests
+Tests for: size threshold, encoding negotiation, per-coding ETags and revalidation
+"""
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compression import JSONCompressionMiddleware
+
+ETAG = '"abc123"'
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(JSONCompressionMiddleware, minimum_size=100)
+
+    @app.get("/api/large")
+    async def large(request: Request):
+        if request.headers.get("if-none-match") == ETAG:
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return JSONResponse({"items": ["x" * 20] * 50}, headers={"ETag": ETAG})
+
+    @app.get("/api/small")
+    async def small():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestCompression:
+    """Encoding negotiation and validator tests"""
+
+    def test_small_bodies_untouched(self):
+        """Test responses under the threshold are sent as-is"""
+        response = make_client().get("/api/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_compressed_etag_differs_from_identity(self):
+        """Test the gzip body carries its own strong ETag"""
+        client = make_client()
+        compressed = client.get("/api/large", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/api/large", headers={"Accept-Encoding": "identity"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == '"abc123-gzip"'
+        assert identity.headers["etag"] == ETAG
+
+    def test_revalidating_compressed_etag(self):
+        """Test If-None-Match with the gzip ETag gets a 304 carrying that ETag"""
+        response = make_client().get(
+            "/api/large", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc123-gzip"'}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123-gzip"'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
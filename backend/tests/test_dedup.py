@@ -0,0 +1,66 @@
+"""
+Duplicate Signature Tests
+Tests for: URL normalization, company/position similarity, LSH band overlap
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import (normalize_url, url_hash, shingles, minhash_bands, jaccard, company_key,
+                   is_near_duplicate, SIMILARITY_THRESHOLD)
+
+
+class TestUrlNormalization:
+    """job_url normalization tests"""
+
+    def test_tracking_params_and_www_ignored(self):
+        """Test the same posting hashes identically across visits"""
+        a = "https://www.linkedin.com/jobs/view/123/?utm_source=google&trk=abc"
+        b = "linkedin.com/jobs/view/123"
+        assert url_hash(a) == url_hash(b)
+
+    def test_meaningful_params_kept(self):
+        """Test non-tracking query params still distinguish postings"""
+        assert normalize_url("boards.greenhouse.io/acme?gh_jid=1") != normalize_url("boards.greenhouse.io/acme?gh_jid=2")
+
+    def test_empty_url(self):
+        """Test missing URLs produce no hash"""
+        assert url_hash(None) is None
+        assert url_hash("  ") is None
+
+
+class TestNearMatch:
+    """Company/position similarity tests"""
+
+    def test_small_differences_are_similar(self):
+        """Test suffixes, punctuation and abbreviations still match"""
+        a = shingles("Acme, Inc.", "Senior Marketing Analyst")
+        b = shingles("ACME", "Sr. Marketing Analyst")
+        assert jaccard(a, b) >= SIMILARITY_THRESHOLD
+        assert set(minhash_bands(a)) & set(minhash_bands(b))
+
+    def test_different_jobs_are_not_similar(self):
+        """Test unrelated applications do not match"""
+        a = shingles("Acme", "Marketing Analyst")
+        b = shingles("Globex", "Data Engineer")
+        assert jaccard(a, b) < SIMILARITY_THRESHOLD
+
+    def test_same_title_at_other_company_is_not_duplicate(self):
+        """Test a shared title cannot outweigh a different employer"""
+        assert is_near_duplicate("Acme", "Marketing Analyst", "Globex", "Marketing Analyst") is None
+        assert is_near_duplicate("Google", "Senior Marketing Analytics Manager",
+                                 "Meta", "Senior Marketing Analytics Manager") is None
+        assert is_near_duplicate("IBM", "Digital Marketing Specialist", "HP", "Digital Marketing Specialist") is None
+
+    def test_same_company_similar_title_is_duplicate(self):
+        """Test company suffixes are ignored and similar titles match"""
+        assert company_key("Acme, Inc.") == company_key("ACME") == "acme"
+        assert is_near_duplicate("Acme, Inc.", "Senior Marketing Analyst", "ACME", "Sr. Marketing Analyst") >= SIMILARITY_THRESHOLD
+        assert is_near_duplicate("Acme", "Marketing Analyst", "Acme", "Data Engineer") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
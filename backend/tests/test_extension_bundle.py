@@ -0,0 +1,138 @@
+"""
+Extension Bundle Tests
+Tests for: reproducible builds, change detection, ETag/304, byte ranges
+"""
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extension_bundle import ExtensionBundle, bundle_response, parse_range
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "ext"
+    (src / "icons").mkdir(parents=True)
+    (src / "manifest.json").write_text('{"name": "JobFill"}')
+    (src / "content.js").write_text("console.log('fill');\n" * 50)
+    (src / "icons" / "icon16.png").write_bytes(b"\x89PNG" + bytes(range(200)))
+    (src / ".DS_Store").write_text("junk")
+    return src
+
+
+class TestExtensionBundle:
+    """Build and change detection tests"""
+
+    def test_zip_contents(self, source):
+        """Test every source file is packaged and hidden files are skipped"""
+        bundle = ExtensionBundle(str(source))
+        assert bundle.current()
+        names = zipfile.ZipFile(io.BytesIO(bundle.data)).namelist()
+        assert names == ["content.js", "icons/icon16.png", "manifest.json"]
+        assert bundle.filename == f"jobfill-extension-{bundle.digest[:16]}.zip"
+
+    def test_reproducible_hash(self, source):
+        """Test touching files without changing them keeps the same hash"""
+        first = ExtensionBundle(str(source))
+        first.current()
+        os.utime(source / "content.js", (1, 1))
+        second = ExtensionBundle(str(source))
+        second.current()
+        assert first.digest == second.digest
+
+    def test_rebuilds_on_change(self, source, tmp_path):
+        """Test an edited source produces a new hash and a new artifact"""
+        out = tmp_path / "out"
+        bundle = ExtensionBundle(str(source), output_dir=str(out), check_interval=0)
+        bundle.current()
+        old = bundle.digest
+        (source / "manifest.json").write_text('{"name": "JobFill", "version": "2"}')
+        bundle.current()
+        assert bundle.digest != old
+        assert bundle.builds == 2
+        assert sorted(os.listdir(out)) == sorted([f"jobfill-extension-{old[:16]}.zip", bundle.filename])
+
+    def test_missing_source(self, tmp_path):
+        """Test no bundle is available when the source directory does not exist"""
+        assert not ExtensionBundle(str(tmp_path / "missing")).current()
+
+
+class TestParseRange:
+    """Range header parsing tests"""
+
+    def test_forms(self):
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+
+    def test_ignored(self):
+        """Test malformed and multi-range headers fall back to a full response"""
+        for header in ("bytes=0-1,5-6", "items=0-1", "bytes=x-y", "bytes=9-2", "bytes=-"):
+            assert parse_range(header, 100) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(ValueError):
+            parse_range("bytes=100-", 100)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-0", 100)
+
+
+class TestBundleResponse:
+    """Conditional and partial response tests"""
+
+    @pytest.fixture
+    def client(self, source):
+        bundle = ExtensionBundle(str(source))
+        bundle.current()
+        app = FastAPI()
+
+        @app.get("/zip")
+        async def download(request: Request):
+            return bundle_response(bundle, request.headers, "no-cache")
+
+        return TestClient(app), bundle
+
+    def test_full_download(self, client):
+        client, bundle = client
+        response = client.get("/zip")
+        assert response.status_code == 200
+        assert response.content == bundle.data
+        assert response.headers["etag"] == f'"{bundle.digest}"'
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_not_modified(self, client):
+        """Test a matching If-None-Match gets an empty 304"""
+        client, bundle = client
+        response = client.get("/zip", headers={"If-None-Match": f'"old", {bundle.etag}'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert client.get("/zip", headers={"If-None-Match": '"old"'}).status_code == 200
+
+    def test_resume_with_range(self, client):
+        """Test a resumed download returns exactly the missing bytes"""
+        client, bundle = client
+        response = client.get("/zip", headers={"Range": "bytes=100-", "If-Range": bundle.etag})
+        assert response.status_code == 206
+        assert response.content == bundle.data[100:]
+        assert response.headers["content-range"] == f"bytes 100-{len(bundle.data) - 1}/{len(bundle.data)}"
+
+    def test_stale_if_range_gets_full_body(self, client):
+        """Test a range against an old build is answered with the whole new zip"""
+        client, bundle = client
+        response = client.get("/zip", headers={"Range": "bytes=100-", "If-Range": '"old"'})
+        assert response.status_code == 200
+        assert response.content == bundle.data
+
+    def test_unsatisfiable_range(self, client):
+        client, bundle = client
+        response = client.get("/zip", headers={"Range": f"bytes={len(bundle.data)}-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(bundle.data)}"
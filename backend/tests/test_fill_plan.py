@@ -0,0 +1,92 @@
+"""
+Fill Plan Tests
+Tests for: name parts, phone formats, date formats, plan hashing
+"""
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fill_plan import build_fill_plan, date_formats, phone_formats, plan_hash
+
+PROFILE = {
+    "personal_info": {
+        "full_name": "Ada Byron Lovelace",
+        "phone": "+1 (309) 612-8928",
+        "country_code": "US",
+        "city": "Normal",
+        "state": "IL",
+    },
+    "work_experience": [
+        {"title": "Analyst", "company": "Acme", "start_date": "Sept 2020", "end_date": None, "current": True},
+    ],
+    "education": [{"degree": "MS", "gpa": "3.92/4.0", "start_date": "2024", "end_date": "May 2026"}],
+    "skills": ["SQL", "Python"],
+}
+
+
+class TestDerivedValues:
+    """Value variant tests"""
+
+    def test_name_parts(self):
+        """Test first/middle/last are split once, server-side"""
+        name = build_fill_plan(PROFILE)["name"]
+        assert (name["first"], name["middle"], name["last"]) == ("Ada", "Byron", "Lovelace")
+        assert name["last_full"] == "Byron Lovelace"
+
+    def test_phone_formats(self):
+        """Test E.164 and US national formats"""
+        phone = phone_formats("+1 (309) 612-8928", "US")
+        assert phone["e164"] == "+13096128928"
+        assert phone["national"] == "(309) 612-8928"
+        assert phone["dashed"] == "309-612-8928"
+
+    def test_foreign_number_keeps_its_prefix(self):
+        """Test an explicit international number is not re-prefixed with the profile country"""
+        assert phone_formats("+91 98765 43210", "US")["e164"] == "+919876543210"
+
+    def test_foreign_number_splits_calling_code(self):
+        """Test a "+" number's own calling code is split off the national digits"""
+        phone = phone_formats("+44 20 7946 0958", "US")
+        assert phone["country_calling_code"] == "+44"
+        assert phone["national_digits"] == "2079460958"
+        assert phone["e164"] == "+442079460958"
+        assert "dashed" not in phone
+
+    def test_unknown_country_has_no_e164(self):
+        """Test a national number with an unknown country gets no E.164 form"""
+        phone = phone_formats("020 7946 0958", None)
+        assert phone["e164"] is None
+        assert phone["country_calling_code"] is None
+        assert phone["national_digits"] == "02079460958"
+
+    def test_date_formats(self):
+        """Test abbreviated month names and year-only dates"""
+        assert date_formats("Sept 2020")["mm_yyyy"] == "09/2020"
+        assert date_formats("Aug 2025")["month_year"] == "August 2025"
+        assert date_formats("2019") == {"raw": "2019", "year": "2019"}
+
+    def test_years_experience_and_gpa(self):
+        """Test derived experience span and numeric GPA"""
+        plan = build_fill_plan(PROFILE, today=date(2026, 10, 1))
+        assert plan["years_experience"] == 6
+        assert plan["education"][0]["gpa_value"] == "3.92"
+
+
+class TestHash:
+    """Version hash tests"""
+
+    def test_hash_changes_with_profile(self):
+        """Test the hash is stable and tracks profile changes"""
+        today = date(2026, 10, 1)
+        first = plan_hash(build_fill_plan(PROFILE, today))
+        assert first == plan_hash(build_fill_plan(PROFILE, today))
+        changed = {**PROFILE, "skills": ["SQL"]}
+        assert first != plan_hash(build_fill_plan(changed, today))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Form Chunking Tests
+Tests for: chunk bounds, order, concurrency, per-chunk retries
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from form_chunks import chunk_items, run_chunks
+
+
+class TestChunkItems:
+    """Chunk splitting tests"""
+
+    def test_order_and_bounds(self):
+        """Test chunks keep input order and respect both limits"""
+        items = [f"f{i}" for i in range(25)]
+        chunks = chunk_items(items, len, max_items=10, max_chars=1000)
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        assert [i for c in chunks for i in c] == items
+
+        chunks = chunk_items(["a" * 40, "b" * 40, "c" * 40], len, max_items=10, max_chars=100)
+        assert [len(c) for c in chunks] == [2, 1]
+
+    def test_oversized_item_gets_own_chunk(self):
+        """Test an item larger than max_chars is not dropped"""
+        chunks = chunk_items(["x", "y" * 500, "z"], len, max_items=10, max_chars=100)
+        assert chunks == [["x"], ["y" * 500], ["z"]]
+
+    def test_empty(self):
+        assert chunk_items([], len, 5, 100) == []
+
+
+class TestRunChunks:
+    """Concurrent chunk execution tests"""
+
+    def test_runs_concurrently(self):
+        """Test wall-clock time tracks the slowest chunk, not the sum"""
+        async def worker(chunk):
+            await asyncio.sleep(0.1)
+            return list(chunk)
+
+        start = time.perf_counter()
+        results = asyncio.run(run_chunks([[1], [2], [3], [4]], worker, concurrency=4))
+        elapsed = time.perf_counter() - start
+        assert [r for r, _ in results] == [[1], [2], [3], [4]]
+        assert elapsed < 0.3
+
+    def test_concurrency_cap(self):
+        """Test no more than `concurrency` chunks are in flight"""
+        in_flight, peak = 0, 0
+
+        async def worker(chunk):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        asyncio.run(run_chunks([[i] for i in range(10)], worker, concurrency=3))
+        assert peak == 3
+
+    def test_failed_chunk_retried_alone(self):
+        """Test a failing chunk is retried without re-running the others"""
+        calls = {}
+
+        async def worker(chunk):
+            calls[chunk[0]] = calls.get(chunk[0], 0) + 1
+            if chunk[0] == "bad" and calls["bad"] == 1:
+                raise ValueError("flaky")
+            return chunk[0]
+
+        results = asyncio.run(run_chunks([["a"], ["bad"], ["c"]], worker, retries=1))
+        assert results == [("a", None), ("bad", None), ("c", None)]
+        assert calls == {"a": 1, "bad": 2, "c": 1}
+
+    def test_exhausted_retries_return_error(self):
+        """Test a chunk that keeps failing reports its error in place"""
+        async def worker(chunk):
+            if chunk[0] == "bad":
+                raise ValueError("down")
+            return chunk[0]
+
+        results = asyncio.run(run_chunks([["a"], ["bad"]], worker, retries=2))
+        assert results[0] == ("a", None)
+        assert results[1][0] is None and isinstance(results[1][1], ValueError)
+
+    def test_no_retry_exceptions(self):
+        """Test exceptions listed in no_retry fail the chunk without another attempt"""
+        calls = 0
+
+        async def worker(chunk):
+            nonlocal calls
+            calls += 1
+            raise LookupError("refused")
+
+        results = asyncio.run(run_chunks([["a"]], worker, retries=3, no_retry=(LookupError,)))
+        assert calls == 1
+        assert isinstance(results[0][1], LookupError)
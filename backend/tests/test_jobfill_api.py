@@ -97,6 +97,43 @@ class TestProfileEndpoints:
         
         data = response.json()
         assert data.get("success") == True
+        
+    def test_patch_profile_with_version(self):
+        """Test PATCH /api/profile updates one field and bumps the version"""
+        profile = requests.get(f"{BASE_URL}/api/profile").json()
+        version = profile.get("version", 0)
+        
+        response = requests.patch(f"{BASE_URL}/api/profile", json={
+            "version": version,
+            "operations": [{"op": "set", "path": "personal_info.phone", "value": profile["personal_info"]["phone"]}]
+        })
+        assert response.status_code == 200
+        assert response.json()["version"] == version + 1
+        
+    def test_patch_profile_stale_version_conflicts(self):
+        """Test PATCH with an outdated version returns 409"""
+        profile = requests.get(f"{BASE_URL}/api/profile").json()
+        stale = profile.get("version", 0) - 1
+        
+        response = requests.patch(
+            f"{BASE_URL}/api/profile",
+            json=[{"op": "replace", "path": "/summary", "value": profile["summary"]}],
+            headers={"If-Match": str(stale)}
+        )
+        assert response.status_code == 409
+
+        
+    def test_fill_plan_revalidates_with_etag(self):
+        """Test GET /api/profile/fill-plan returns a hashed plan and 304 on revalidation"""
+        response = requests.get(f"{BASE_URL}/api/profile/fill-plan")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "first" in data["plan"]["name"]
+        assert "e164" in data["plan"]["phone"]
+        
+        cached = requests.get(f"{BASE_URL}/api/profile/fill-plan", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
 
 
 class TestSettingsEndpoints:
@@ -232,6 +269,201 @@ class TestApplicationsEndpoints:
             delete_response = requests.delete(f"{BASE_URL}/api/applications/{app['_id']}")
             assert delete_response.status_code == 200
 
+        
+    def test_duplicate_application_is_detected(self):
+        """Test a near-identical second log is reported and skipped"""
+        suffix = datetime.now().strftime("%H%M%S%f")
+        first = {
+            "company": f"TEST_Dup Corp {suffix}",
+            "position": "Senior Marketing Analyst",
+            "platform": "LinkedIn",
+            "applied_date": datetime.now().isoformat(),
+            "job_url": f"https://www.test.com/jobs/{suffix}?utm_source=linkedin"
+        }
+        created = requests.post(f"{BASE_URL}/api/applications", json=first).json()["application"]
+        
+        try:
+            check = requests.post(f"{BASE_URL}/api/applications/check-duplicates", json={
+                "company": f"TEST_Dup Corp, Inc. {suffix}",
+                "position": "Sr. Marketing Analyst"
+            })
+            assert check.status_code == 200
+            assert any(d["_id"] == created["_id"] for d in check.json()["duplicates"])
+            
+            second = {**first, "job_url": f"https://test.com/jobs/{suffix}/"}
+            response = requests.post(f"{BASE_URL}/api/applications?on_duplicate=skip", json=second)
+            data = response.json()
+            assert data.get("skipped") == True
+            assert data["application"]["_id"] == created["_id"]
+            assert data["duplicates"][0]["match"] == "exact_url"
+        finally:
+            requests.delete(f"{BASE_URL}/api/applications/{created['_id']}")
+
+    def test_similar_posting_with_other_url_is_not_skipped(self):
+        """Test a same-title posting at a different URL is logged and only reported"""
+        suffix = datetime.now().strftime("%H%M%S%f")
+        first = {
+            "company": f"TEST_Dup Corp {suffix}",
+            "position": "Marketing Analyst",
+            "platform": "LinkedIn",
+            "applied_date": datetime.now().isoformat(),
+            "job_url": f"https://www.test.com/jobs/{suffix}-1"
+        }
+        created = requests.post(f"{BASE_URL}/api/applications", json=first).json()["application"]
+        second_id = None
+        
+        try:
+            second = {**first, "job_url": f"https://www.test.com/jobs/{suffix}-2"}
+            data = requests.post(f"{BASE_URL}/api/applications?on_duplicate=skip", json=second).json()
+            assert data.get("skipped") is None
+            second_id = data["application"]["_id"]
+            assert second_id != created["_id"]
+            assert any(d["match"] == "similar" for d in data["duplicates"])
+        finally:
+            requests.delete(f"{BASE_URL}/api/applications/{created['_id']}")
+            if second_id:
+                requests.delete(f"{BASE_URL}/api/applications/{second_id}")
+
+    def test_same_title_other_company_is_not_skipped(self):
+        """Test a manual log without URL does not swallow the same title at another company"""
+        suffix = datetime.now().strftime("%H%M%S%f")
+        first = {
+            "company": f"TEST_Acme {suffix}",
+            "position": "Marketing Analyst",
+            "platform": "LinkedIn",
+            "applied_date": datetime.now().isoformat()
+        }
+        created = requests.post(f"{BASE_URL}/api/applications", json=first).json()["application"]
+        second_id = None
+        
+        try:
+            second = {**first, "company": f"TEST_Globex {suffix}", "job_url": f"https://www.test.com/jobs/{suffix}"}
+            data = requests.post(f"{BASE_URL}/api/applications?on_duplicate=skip", json=second).json()
+            assert data.get("skipped") is None
+            second_id = data["application"]["_id"]
+            assert all(d["_id"] != created["_id"] for d in data.get("duplicates", []))
+        finally:
+            requests.delete(f"{BASE_URL}/api/applications/{created['_id']}")
+            if second_id:
+                requests.delete(f"{BASE_URL}/api/applications/{second_id}")
+
+        
+    def test_status_transition_records_history(self):
+        """Test POST /api/applications/{id}/status changes status and appends history"""
+        test_app = {
+            "company": "TEST_Status_" + datetime.now().strftime("%H%M%S%f"),
+            "position": "TEST_Position",
+            "platform": "Lever",
+            "applied_date": datetime.now().isoformat()
+        }
+        app_id = requests.post(f"{BASE_URL}/api/applications", json=test_app).json()["application"]["_id"]
+        
+        try:
+            response = requests.post(f"{BASE_URL}/api/applications/{app_id}/status", json={"status": "Interview"})
+            assert response.status_code == 200
+            assert response.json()["changed"] == True
+            
+            history = requests.get(f"{BASE_URL}/api/applications/{app_id}/history").json()["history"]
+            assert [e["to_status"] for e in history] == ["Applied", "Interview"]
+            
+            bulk = requests.post(f"{BASE_URL}/api/applications/status", json={"ids": [app_id], "status": "Interview"})
+            assert bulk.json()["unchanged"] == 1
+        finally:
+            requests.delete(f"{BASE_URL}/api/applications/{app_id}")
+        
+    def test_archive_stats_structure(self):
+        """Test GET /api/applications/archive/stats reports both tiers"""
+        response = requests.get(f"{BASE_URL}/api/applications/archive/stats")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "hot" in data
+        assert "archive" in data
+        assert "working_set_reduction_pct" in data
+        
+    def test_include_archived_counts_both_tiers(self):
+        """Test include_archived never returns fewer applications than the hot tier"""
+        hot = requests.get(f"{BASE_URL}/api/applications").json()
+        both = requests.get(f"{BASE_URL}/api/applications?include_archived=true").json()
+        assert both["total"] >= hot["total"]
+
+    def test_unarchive_invalid_id(self):
+        """Test a malformed id is rejected with 400, not a server error"""
+        response = requests.post(f"{BASE_URL}/api/applications/not-an-id/unarchive")
+        assert response.status_code == 400
+
+
+class TestBootstrapEndpoint:
+    """Bootstrap endpoint and response compression tests"""
+    
+    def test_bootstrap_returns_all_sections(self):
+        """Test GET /api/bootstrap returns profile, settings, stats and recent applications"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "personal_info" in data["profile"]
+        assert "ai_provider" in data["settings"]
+        assert "status_breakdown" in data["stats"]
+        assert isinstance(data["recent_applications"], list)
+        
+    def test_bootstrap_sections(self):
+        """Test GET /api/bootstrap?sections= returns only the requested sections"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap", params={"sections": "stats,recent", "recent_limit": 2})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert set(data) == {"stats", "recent_applications"}
+        assert len(data["recent_applications"]) <= 2
+        
+        response = requests.get(f"{BASE_URL}/api/bootstrap", params={"sections": "profile,bogus"})
+        assert response.status_code == 400
+        
+    def test_large_json_is_compressed(self):
+        """Test profile payload is gzip-encoded when the client accepts it"""
+        response = requests.get(f"{BASE_URL}/api/profile", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+
+    def test_live_event_stats(self):
+        """Test GET /api/events/stats reports the live update channel"""
+        response = requests.get(f"{BASE_URL}/api/events/stats")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "subscribers" in data
+        assert "last_event_id" in data
+
+
+class TestSavedJobEndpoints:
+    """Saved job pre-generation tests"""
+    
+    def test_save_job_is_queued(self):
+        """Test POST /api/jobs/saved queues work and the job is retrievable"""
+        job = {
+            "job_url": "https://test.com/jobs/TEST_saved_" + datetime.now().strftime("%H%M%S%f"),
+            "job_title": "TEST_Position",
+            "company": "TEST_Company",
+            "fields": [{"field_name": "email", "field_type": "email", "label": "Email"}]
+        }
+        response = requests.post(f"{BASE_URL}/api/jobs/saved", json=job)
+        assert response.status_code == 200
+        
+        job_key = response.json()["job_key"]
+        saved = requests.get(f"{BASE_URL}/api/jobs/saved/{job_key}")
+        assert saved.status_code == 200
+        assert saved.json()["status"] in ["queued", "running", "retrying", "ready", "failed"]
+        
+    def test_queue_status_structure(self):
+        """Test GET /api/jobs/queue reports depth and workers"""
+        response = requests.get(f"{BASE_URL}/api/jobs/queue")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "depth" in data
+        assert "workers" in data
+        assert "capacity" in data
+
 
 class TestExtensionDownload:
     """Extension download endpoint tests"""
@@ -257,6 +489,28 @@ class TestExtensionDownload:
         # Zip files start with PK signature
         assert response.content[:2] == b'PK'
 
+    def test_extension_download_conditional_and_range(self):
+        """Test the zip has a strong ETag, answers If-None-Match with 304 and serves ranges"""
+        response = requests.get(f"{BASE_URL}/api/extension/download")
+        etag = response.headers.get('etag')
+        assert etag and not etag.startswith('W/')
+        
+        cached = requests.get(f"{BASE_URL}/api/extension/download", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        
+        partial = requests.get(f"{BASE_URL}/api/extension/download", headers={"Range": "bytes=0-1"})
+        assert partial.status_code == 206
+        assert partial.content == b'PK'
+        
+    def test_extension_versioned_download_is_immutable(self):
+        """Test the content-hash URL from /api/extension/info is cached long-term"""
+        info = requests.get(f"{BASE_URL}/api/extension/info").json()
+        assert info["available"] == True
+        
+        response = requests.get(f"{BASE_URL}{info['download_url']}")
+        assert response.status_code == 200
+        assert "immutable" in response.headers.get('cache-control', '')
+
 
 class TestAIFormAnalysis:
     """AI form analysis endpoint tests"""
@@ -291,6 +545,18 @@ class TestAIFormAnalysis:
         assert data.get("success") == True
         assert "field_mappings" in data
         assert isinstance(data["field_mappings"], list)
+        
+    def test_admission_stats_structure(self):
+        """Test GET /api/ai/admission exposes queue depth and rejection counts"""
+        response = requests.get(f"{BASE_URL}/api/ai/admission")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "queue_depth" in data
+        assert "in_flight" in data
+        assert "rejected_rate_limited" in data
+        assert "fallback_served" in data
+        assert "upstream_calls_saved" in data["coalescing"]
 
 
 if __name__ == "__main__":
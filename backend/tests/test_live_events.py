@@ -0,0 +1,154 @@
+"""
+Live Events Tests
+Tests for: stats deltas, resume from Last-Event-ID, resync, SSE framing
+"""
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live_events import EventBroker, event_stream, format_sse, stats_delta
+
+STATUSES = ["Applied", "In Progress", "Interview", "Rejected", "Offer"]
+PLATFORMS = ["LinkedIn", "Indeed", "Other"]
+NOW = datetime(2026, 3, 10, 15, 0)
+
+
+def delta(before, after):
+    return stats_delta(before, after, STATUSES, PLATFORMS, NOW)
+
+
+class TestStatsDelta:
+    """Incremental stats tests"""
+
+    def test_create(self):
+        """Test a new application today counts everywhere"""
+        doc = {"status": "Applied", "platform": "LinkedIn", "applied_date": "2026-03-10T09:00:00"}
+        assert delta(None, doc) == {
+            "total": 1,
+            "status_breakdown": {"Applied": 1},
+            "platform_breakdown": {"LinkedIn": 1},
+            "weekly_applications": 1,
+            "today_applications": 1,
+        }
+
+    def test_delete_old(self):
+        """Test deleting an old application leaves weekly/today untouched"""
+        doc = {"status": "Rejected", "platform": "Indeed", "applied_date": "2025-12-01T09:00:00"}
+        assert delta(doc, None) == {"total": -1, "status_breakdown": {"Rejected": -1}, "platform_breakdown": {"Indeed": -1}}
+
+    def test_status_change_only_moves_status(self):
+        before = {"status": "Applied", "platform": "LinkedIn", "applied_date": "2026-03-09T09:00:00"}
+        assert delta(before, {**before, "status": "Interview"}) == {"status_breakdown": {"Applied": -1, "Interview": 1}}
+
+    def test_unlisted_platform_ignored(self):
+        """Test platforms the stats do not list only change the total"""
+        assert delta(None, {"status": "Applied", "platform": "Dice"}) == {"total": 1, "status_breakdown": {"Applied": 1}}
+
+    def test_no_change(self):
+        doc = {"status": "Applied", "platform": "Other"}
+        assert delta(doc, dict(doc)) == {}
+
+
+class TestEventBroker:
+    """Fan-out and resume tests"""
+
+    def test_fan_out(self):
+        async def run():
+            broker = EventBroker()
+            a, _ = broker.subscribe()
+            b, _ = broker.subscribe()
+            broker.publish("application.created", {"id": "1"})
+            return a.queue.get_nowait(), b.queue.get_nowait()
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert first[1] == "application.created"
+
+    def test_resume_replays_missed_events(self):
+        """Test reconnecting with the last seen id replays only what was missed"""
+        async def run():
+            broker = EventBroker()
+            seen = broker.publish("application.created", {"id": "1"})
+            broker.publish("application.updated", {"id": "1"})
+            broker.publish("application.deleted", {"id": "1"})
+            _, replay = broker.subscribe(seen)
+            return broker, replay
+
+        broker, replay = asyncio.run(run())
+        assert [event_type for _, event_type, _ in replay] == ["application.updated", "application.deleted"]
+        assert broker.counters["resumed"] == 1
+
+    def test_up_to_date_resume(self):
+        async def run():
+            broker = EventBroker()
+            seen = broker.publish("application.created", {"id": "1"})
+            return broker.subscribe(seen)[1]
+
+        assert asyncio.run(run()) == []
+
+    def test_resync_when_too_far_behind(self):
+        """Test ids older than the buffer, or from another process, need a resync"""
+        async def run():
+            broker = EventBroker(buffer_size=2)
+            first = broker.publish("application.created", {"id": "1"})
+            for i in range(3):
+                broker.publish("application.updated", {"id": str(i)})
+            return broker.subscribe(first)[1], broker.subscribe("0-5")[1], broker.subscribe("garbage")[1]
+
+        assert asyncio.run(run()) == (None, None, None)
+
+    def test_overflow_marks_subscriber(self):
+        async def run():
+            broker = EventBroker(subscriber_queue=2)
+            subscriber, _ = broker.subscribe()
+            for i in range(3):
+                broker.publish("application.created", {"id": str(i)})
+            return broker, subscriber
+
+        broker, subscriber = asyncio.run(run())
+        assert subscriber.overflowed
+        assert broker.counters["overflows"] == 1
+
+
+class TestEventStream:
+    """SSE stream tests"""
+
+    def test_format(self):
+        assert format_sse("a-1", "resync", {"x": 1}) == 'id: a-1\nevent: resync\ndata: {"x": 1}\n\n'
+
+    def test_stream_replays_then_goes_live(self):
+        """Test a resumed stream sends missed events, then live ones, and unsubscribes on close"""
+        async def run():
+            broker = EventBroker()
+            seen = broker.publish("application.created", {"id": "1"})
+            broker.publish("application.deleted", {"id": "1"})
+            stream = event_stream(broker, seen, heartbeat=0.05)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            broker.publish("application.created", {"id": "2"})
+            chunks.append(await stream.__anext__())
+            chunks.append(await stream.__anext__())  # heartbeat
+            await stream.aclose()
+            return broker, chunks
+
+        broker, chunks = asyncio.run(run())
+        assert chunks[0].startswith("retry:")
+        assert "event: application.deleted" in chunks[1]
+        assert "event: application.created" in chunks[2]
+        assert json.loads(chunks[2].split("data: ")[1]) == {"id": "2"}
+        assert chunks[3] == ": ping\n\n"
+        assert broker.snapshot()["subscribers"] == 0
+
+    def test_stream_resync(self):
+        """Test an unknown Last-Event-ID starts with a resync event"""
+        async def run():
+            broker = EventBroker()
+            stream = event_stream(broker, "stale-3")
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return chunks
+
+        assert "event: resync" in asyncio.run(run())[1]
@@ -0,0 +1,138 @@
+"""
+LLM Router Tests
+Tests for: provider ranking, rolling stats, hedged requests (local stub providers)
+"""
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_router
+from llm_router import ClaudeProvider, LLMRouter, LLMProvider
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+class StubProvider(LLMProvider):
+    """Provider with a fixed latency that can be told to fail"""
+
+    def __init__(self, name, latency, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    async def complete(self, messages, temperature=0.3, max_tokens=2000):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return f"answer from {self.name}"
+
+
+class TestRouting:
+    """Preferred provider and ranking tests"""
+
+    def test_preferred_provider_is_used(self):
+        """Test the setting's provider answers when hedging is off"""
+        router = LLMRouter()
+        fast, slow = StubProvider("fast", 0.01), StubProvider("slow", 0.05)
+        result = asyncio.run(router.complete([fast, slow], MESSAGES, preferred="slow"))
+
+        assert result["provider"] == "slow"
+        assert result["hedged"] is False
+        assert fast.calls == 0
+
+    def test_stats_are_recorded(self):
+        """Test latency and errors land in the rolling window"""
+        router = LLMRouter()
+        ok, bad = StubProvider("ok", 0.01), StubProvider("bad", 0.01, fail=True)
+        asyncio.run(router.complete([ok], MESSAGES))
+        with pytest.raises(RuntimeError):
+            asyncio.run(router.complete([bad], MESSAGES))
+
+        stats = router.snapshot()
+        assert stats["ok"]["total_calls"] == 1
+        assert stats["ok"]["error_rate"] == 0
+        assert stats["bad"]["error_rate"] == 1
+
+    def test_rank_orders_by_latency(self):
+        """Test non-preferred providers are ordered fastest first"""
+        router = LLMRouter()
+        a, b, c = StubProvider("a", 0.05), StubProvider("b", 0.01), StubProvider("c", 0.03)
+        for provider in (a, b, c):
+            asyncio.run(router.complete([provider], MESSAGES))
+
+        assert [p.name for p in router.rank([a, b, c], preferred="a")] == ["a", "b", "c"]
+
+
+class TestHedging:
+    """Hedged request tests"""
+
+    def test_hedge_takes_faster_backup(self):
+        """Test a slow primary is beaten by the hedge to the next-fastest provider"""
+        router = LLMRouter()
+        slow, fast = StubProvider("slow", 0.5), StubProvider("fast", 0.02)
+        result = asyncio.run(router.complete([slow, fast], MESSAGES, preferred="slow", hedge_delay=0.05))
+
+        assert result["provider"] == "fast"
+        assert result["hedged"] is True
+        assert router.snapshot()["fast"]["hedge_wins"] == 1
+
+    def test_no_hedge_when_primary_is_quick(self):
+        """Test the backup is never called if the primary answers within the delay"""
+        router = LLMRouter()
+        quick, backup = StubProvider("quick", 0.01), StubProvider("backup", 0.01)
+        result = asyncio.run(router.complete([quick, backup], MESSAGES, preferred="quick", hedge_delay=0.2))
+
+        assert result["provider"] == "quick"
+        assert backup.calls == 0
+
+    def test_hedge_covers_primary_failure(self):
+        """Test an early primary failure fires the backup immediately"""
+        router = LLMRouter()
+        broken, backup = StubProvider("broken", 0.01, fail=True), StubProvider("backup", 0.01)
+        result = asyncio.run(router.complete([broken, backup], MESSAGES, preferred="broken", hedge_delay=1.0))
+
+        assert result["provider"] == "backup"
+
+
+
+class TestProviders:
+    """Provider base class and HTTP client tests"""
+
+    def test_base_provider_is_abstract(self):
+        """Test a provider without complete() cannot be instantiated"""
+        with pytest.raises(TypeError):
+            LLMProvider()
+
+    def test_claude_reuses_http_client(self, monkeypatch):
+        """Test consecutive Claude calls share one pooled client until closed"""
+        created = []
+        async_client = httpx.AsyncClient
+
+        def handler(request):
+            return httpx.Response(200, json={"content": [{"type": "text", "text": " hi "}]})
+
+        def make_client(**kwargs):
+            created.append(kwargs)
+            return async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+        monkeypatch.setattr(llm_router.httpx, "AsyncClient", make_client)
+        provider = ClaudeProvider("key", timeout=5.0)
+
+        async def run():
+            answers = [await provider.complete(MESSAGES) for _ in range(3)]
+            await provider.aclose()
+            return answers
+
+        assert asyncio.run(run()) == ["hi", "hi", "hi"]
+        assert created == [{"timeout": 5.0}]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
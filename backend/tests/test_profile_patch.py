@@ -0,0 +1,135 @@
+"""
+Profile Patch Tests
+Tests for: path parsing, JSON Patch / field-path translation to MongoDB operators, validation
+"""
+import os
+import sys
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profile_patch import apply_index_removals, compile_patch, parse_path, PatchError
+
+
+class Info(BaseModel):
+    phone: str
+    website: Optional[str] = None
+
+
+class Job(BaseModel):
+    id: str
+    title: str
+
+
+class SampleProfile(BaseModel):
+    personal_info: Info
+    skills: List[str]
+    work_experience: List[Job]
+
+
+def compile_ops(*ops):
+    return compile_patch(list(ops), SampleProfile, {"highlight_tags": List[str]})
+
+
+class TestPaths:
+    """Path parsing tests"""
+
+    def test_pointer_and_dotted_paths(self):
+        """Test JSON Pointer and dotted paths parse the same"""
+        assert parse_path("/personal_info/phone") == parse_path("personal_info.phone")
+
+    def test_unknown_field_rejected(self):
+        """Test paths outside the model are rejected"""
+        with pytest.raises(PatchError):
+            compile_ops({"op": "set", "path": "version", "value": 99})
+
+
+class TestTranslation:
+    """Operation translation tests"""
+
+    def test_single_field_set(self):
+        """Test editing a phone number only touches that field"""
+        update, compact = compile_ops({"op": "replace", "path": "/personal_info/phone", "value": "+1 555"})
+        assert update == {"$set": {"personal_info.phone": "+1 555"}}
+        assert compact == []
+
+    def test_push_and_pull(self):
+        """Test appends become $push and removals by match become $pull"""
+        update, _ = compile_ops(
+            {"op": "add", "path": "/skills/-", "value": "dbt"},
+            {"op": "pull", "path": "work_experience", "value": {"id": "exp3"}},
+        )
+        assert update["$push"] == {"skills": {"$each": ["dbt"]}}
+        assert update["$pull"] == {"work_experience": {"id": "exp3"}}
+
+    def test_insert_at_position(self):
+        """Test JSON Patch add at an index uses $position"""
+        update, _ = compile_ops({"op": "add", "path": "/skills/0", "value": "SQL"})
+        assert update == {"$push": {"skills": {"$each": ["SQL"], "$position": 0}}}
+
+    def test_insert_then_append_rejected(self):
+        """Test an append after an insert-at-index on the same array is rejected"""
+        with pytest.raises(PatchError, match="Multiple"):
+            compile_ops(
+                {"op": "add", "path": "/skills/0", "value": "A"},
+                {"op": "add", "path": "/skills/-", "value": "B"},
+            )
+
+    def test_append_then_insert_rejected(self):
+        """Test an insert-at-index after an append on the same array is rejected"""
+        with pytest.raises(PatchError, match="Multiple"):
+            compile_ops(
+                {"op": "add", "path": "/skills/-", "value": "B"},
+                {"op": "add", "path": "/skills/0", "value": "A"},
+            )
+
+    def test_remove_by_index(self):
+        """Test index removal is marked for compaction"""
+        update, compact = compile_ops({"op": "remove", "path": "/work_experience/2"})
+        assert update == {"$unset": {"work_experience.2": ""}}
+        assert compact == ["work_experience"]
+
+    def test_index_removal_is_one_set(self):
+        """Test removals become a $set of the compacted array (no null holes)"""
+        update, compact = compile_ops(
+            {"op": "remove", "path": "/work_experience/0"},
+            {"op": "remove", "path": "/work_experience/2"},
+            {"op": "replace", "path": "/personal_info/phone", "value": "+1 555"},
+        )
+        document = {"work_experience": [{"id": "a"}, {"id": "b"}, {"id": "c"}]}
+        assert apply_index_removals(update, compact, document) == {
+            "$set": {"personal_info.phone": "+1 555", "work_experience": [{"id": "b"}]}
+        }
+
+    def test_index_removal_out_of_range(self):
+        update, compact = compile_ops({"op": "remove", "path": "/work_experience/5"})
+        with pytest.raises(PatchError):
+            apply_index_removals(update, compact, {"work_experience": [{"id": "a"}]})
+
+    def test_extra_fields(self):
+        """Test fields stored outside the model can be patched"""
+        update, _ = compile_ops({"op": "push", "path": "highlight_tags", "value": "New tag"})
+        assert update["$push"] == {"highlight_tags": {"$each": ["New tag"]}}
+
+
+class TestValidation:
+    """Value validation tests"""
+
+    def test_invalid_item_rejected(self):
+        """Test pushed items are validated against the array item model"""
+        with pytest.raises(PatchError):
+            compile_ops({"op": "push", "path": "work_experience", "value": {"id": "x"}})
+
+    def test_required_field_cannot_be_removed(self):
+        """Test removing a required field fails and an optional one is nulled"""
+        with pytest.raises(PatchError):
+            compile_ops({"op": "remove", "path": "/personal_info/phone"})
+        update, _ = compile_ops({"op": "remove", "path": "/personal_info/website"})
+        assert update == {"$set": {"personal_info.website": None}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,149 @@
+"""
+Request Profiling Tests
+Tests for: opt-in triggers, phase timings, collapsed stacks, no-op phases
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiling import ProfileStore, ProfilingMiddleware, phase
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_client(keep=50, **options):
+    app = FastAPI()
+    store = ProfileStore(keep=keep)
+    app.add_middleware(ProfilingMiddleware, store=store, **options)
+
+    @app.get("/api/work")
+    async def work():
+        with phase("cpu"):
+            busy(0.05)
+        with phase("db"):
+            await asyncio.to_thread(busy, 0.03)
+        return {"ok": True}
+
+    @app.get("/api/events/applications")
+    async def events():
+        return StreamingResponse(iter(["retry: 3000\n\n"]), media_type="text/event-stream")
+
+    return TestClient(app), store
+
+
+class TestProfilingMiddleware:
+    """Profiling trigger and capture tests"""
+
+    def test_not_profiled_without_header(self):
+        """Test requests are untouched unless the admin header matches"""
+        client, store = make_client(admin_token="secret")
+        response = client.get("/api/work", headers={"X-Profile": "wrong"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+    def test_admin_header_captures_profile(self):
+        """Test the admin header produces phases and sampled stacks"""
+        client, store = make_client(admin_token="secret")
+        response = client.get("/api/work", headers={"X-Profile": "secret"})
+        assert response.status_code == 200
+
+        capture = store.get(response.headers["x-profile-id"])
+        data = capture.to_dict()
+        assert data["reason"] == "header"
+        assert data["status_code"] == 200
+        assert set(data["breakdown"]) >= {"cpu", "db", "send_response"}
+        assert data["breakdown"]["cpu"]["total_ms"] >= 45
+        assert capture.samples > 0
+
+    def test_folded_stacks_cover_worker_threads(self):
+        """Test collapsed stacks include frames from the to_thread phase"""
+        client, store = make_client(admin_token="secret")
+        response = client.get("/api/work", headers={"X-Profile": "secret"})
+        folded = store.get(response.headers["x-profile-id"]).folded()
+
+        for line in folded.strip().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert "busy (test_profiling.py" in folded
+        assert "work (test_profiling.py" in folded
+
+    def test_wrong_token_not_profiled(self):
+        """Test a request with the wrong X-Profile value is not profiled"""
+        client, store = make_client(admin_token="secret")
+        response = client.get("/api/work", headers={"X-Profile": "secreT"})
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+    def test_sample_rate(self):
+        """Test sample_rate=1 profiles every request"""
+        client, store = make_client(sample_rate=1.0)
+        client.get("/api/work")
+        client.get("/api/work")
+        assert [p["reason"] for p in store.list()] == ["sampled", "sampled"]
+
+    def test_debug_paths_excluded(self):
+        """Test the profile endpoints themselves are never profiled"""
+        client, store = make_client(sample_rate=1.0)
+        client.get("/api/debug/profiles")
+        assert store.list() == []
+
+    def test_event_streams_excluded(self):
+        """Test SSE streams are never profiled, even when sampled"""
+        client, store = make_client(sample_rate=1.0)
+        response = client.get("/api/events/applications")
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+
+class TestProfileEndpoints:
+    """Server profile endpoint access tests"""
+
+    def test_not_mounted_without_token(self, monkeypatch):
+        """Test sampling without an admin token does not expose captures"""
+        monkeypatch.delenv("PROFILE_ADMIN_TOKEN", raising=False)
+        import server
+        if server.PROFILE_ADMIN_TOKEN:
+            pytest.skip("PROFILE_ADMIN_TOKEN is set in this environment")
+        paths = {route.path for route in server.app.routes}
+        assert not any(path.startswith("/api/debug/profiles") for path in paths)
+
+    def test_access_requires_matching_token(self, monkeypatch):
+        """Test the dependency rejects a missing or wrong token and accepts the right one"""
+        import server
+        monkeypatch.setattr(server, "PROFILE_ADMIN_TOKEN", "secret")
+        app = FastAPI()
+        app.include_router(server.profile_routes)
+        client = TestClient(app)
+        assert client.get("/api/debug/profiles").status_code == 403
+        assert client.get("/api/debug/profiles", headers={"X-Profile": "wrong"}).status_code == 403
+        assert client.get("/api/debug/profiles", headers={"X-Profile": "secret"}).status_code == 200
+
+
+class TestPhase:
+    """Phase context manager tests"""
+
+    def test_noop_outside_profiled_request(self):
+        """Test phase() does nothing when no request is being profiled"""
+        with phase("anything"):
+            value = 1
+        assert value == 1
+
+    def test_store_keeps_most_recent(self):
+        """Test the store drops the oldest captures"""
+        client, store = make_client(keep=2, sample_rate=1.0)
+        for _ in range(3):
+            client.get("/api/work")
+        assert len(store.list()) == 2
@@ -0,0 +1,143 @@
+"""
+Single-Flight Tests
+Tests for: fingerprints, coalescing, error sharing, cancellation
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from single_flight import SingleFlight, Disconnected, fingerprint
+
+
+class TestFingerprint:
+    """Request fingerprint tests"""
+
+    def test_ignores_key_order_and_whitespace(self):
+        """Test equivalent payloads hash the same"""
+        a = {"fields": [{"field_name": "email", "label": " Email "}], "company": "Acme"}
+        b = {"company": "Acme", "fields": [{"label": "Email", "field_name": "email"}]}
+        assert fingerprint(a) == fingerprint(b)
+
+    def test_field_order_matters(self):
+        """Test different field lists hash differently"""
+        assert fingerprint({"fields": ["a", "b"]}) != fingerprint({"fields": ["b", "a"]})
+
+
+class TestSingleFlight:
+    """Coalescing tests"""
+
+    def test_identical_calls_share_one_computation(self):
+        """Test concurrent callers with the same key run the factory once"""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        async def run():
+            flights = SingleFlight()
+            results = await asyncio.gather(*(flights.do("k", factory) for _ in range(5)))
+            return flights, results
+
+        flights, results = asyncio.run(run())
+        assert calls == 1
+        assert [r for r, _ in results] == [{"value": 42}] * 5
+        assert [shared for _, shared in results] == [False, True, True, True, True]
+        assert flights.snapshot()["upstream_calls_saved"] == 4
+        assert flights.in_flight == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test a finished flight is not reused"""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        async def run():
+            flights = SingleFlight()
+            return [await flights.do("k", factory) for _ in range(2)]
+
+        assert asyncio.run(run()) == [(1, False), (2, False)]
+
+    def test_errors_reach_every_waiter(self):
+        """Test an exception is raised to all coalesced callers"""
+        async def factory():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def run():
+            flights = SingleFlight()
+            return await asyncio.gather(*(flights.do("k", factory) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_one_waiter_leaving_keeps_computation(self):
+        """Test cancelling one waiter does not cancel the shared work"""
+        async def factory():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            flights = SingleFlight()
+            first = asyncio.create_task(flights.do("k", factory))
+            second = asyncio.create_task(flights.do("k", factory))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return flights, await second
+
+        flights, result = asyncio.run(run())
+        assert result == ("done", True)
+        assert flights.counters["cancelled"] == 0
+
+    def test_all_waiters_leaving_cancels_computation(self):
+        """Test the shared work is cancelled when every waiter is gone"""
+
+        async def run():
+            flights = SingleFlight()
+            state = {"cancelled": False}
+
+            async def factory():
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    state["cancelled"] = True
+                    raise
+
+            waiters = [asyncio.create_task(flights.do("k", factory)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+            return flights, state
+
+        flights, state = asyncio.run(run())
+        assert state["cancelled"]
+        assert flights.counters["cancelled"] == 1
+        assert flights.in_flight == 0
+
+    def test_disconnected_waiter(self):
+        """Test a waiter whose client disconnects gets Disconnected"""
+        async def factory():
+            await asyncio.sleep(10)
+
+        async def gone():
+            return True
+
+        async def run():
+            flights = SingleFlight(poll_interval=0.01)
+            with pytest.raises(Disconnected):
+                await flights.do("k", factory, gone)
+            return flights
+
+        flights = asyncio.run(run())
+        assert flights.counters["cancelled"] == 1
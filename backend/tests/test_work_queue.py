@@ -0,0 +1,125 @@
+"""
+Work Queue Tests
+Tests for: priority order, retries, backpressure, shutdown, resubmission
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from work_queue import WorkQueue, QueueFull
+
+
+class TestWorkQueue:
+    """Priority work queue tests"""
+
+    def test_priority_order(self):
+        """Test lower priority numbers run first with a single worker"""
+        order = []
+
+        async def handler(key, payload, attempt):
+            order.append(key)
+
+        async def run():
+            queue = WorkQueue(handler, workers=1)
+            await queue.start()
+            queue.submit("low", None, priority=9)
+            queue.submit("high", None, priority=1)
+            queue.submit("mid", None, priority=5)
+            await queue._queue.join()
+            await queue.stop()
+
+        asyncio.run(run())
+        assert order == ["high", "mid", "low"]
+
+    def test_retry_then_success(self):
+        """Test a failing job is retried and its result kept"""
+        async def handler(key, payload, attempt):
+            if attempt < 3:
+                raise RuntimeError("flaky")
+            return "ok"
+
+        async def run():
+            queue = WorkQueue(handler, workers=1, max_attempts=3, backoff=0.01)
+            await queue.start()
+            job = queue.submit("job", None)
+            while job.status not in ("done", "failed"):
+                await asyncio.sleep(0.01)
+            await queue.stop()
+            return queue, job
+
+        queue, job = asyncio.run(run())
+        assert job.status == "done"
+        assert job.result == "ok"
+        assert queue.counters["retried"] == 2
+
+    def test_backpressure(self):
+        """Test submissions beyond capacity are refused and duplicates coalesce"""
+        async def handler(key, payload, attempt):
+            await asyncio.sleep(1)
+
+        async def run():
+            queue = WorkQueue(handler, workers=1, maxsize=2)
+            await queue.start()
+            first = queue.submit("a", None)
+            assert queue.submit("a", None) is first
+            queue.submit("b", None)
+            with pytest.raises(QueueFull):
+                queue.submit("c", None)
+            await queue.stop()
+
+        asyncio.run(run())
+
+    def test_stop_cancels_pending_retries(self):
+        """Test a retry scheduled before stop() never fires afterwards"""
+        calls = []
+
+        async def handler(key, payload, attempt):
+            calls.append(attempt)
+            raise RuntimeError("down")
+
+        async def run():
+            queue = WorkQueue(handler, workers=1, max_attempts=3, backoff=0.2)
+            await queue.start()
+            job = queue.submit("job", None)
+            while job.status != "retrying":
+                await asyncio.sleep(0.01)
+            await queue.stop()
+            await asyncio.sleep(0.3)
+            return queue
+
+        queue = asyncio.run(run())
+        assert calls == [1]
+        assert not queue._retry_timers
+
+    def test_resubmit_while_running_reruns(self):
+        """Test new input saved while a job runs is picked up by a second run"""
+        seen = []
+
+        async def handler(key, payload, attempt):
+            seen.append(payload)
+            await asyncio.sleep(0.05)
+
+        async def run():
+            queue = WorkQueue(handler, workers=1)
+            await queue.start()
+            job = queue.submit("job", "v1")
+            while job.status != "running":
+                await asyncio.sleep(0.005)
+            assert queue.submit("job", "v2", replace=True) is job
+            assert job.to_dict()["dirty"] is True
+            while not (job.status == "done" and len(seen) == 2):
+                await asyncio.sleep(0.01)
+            await queue.stop()
+            return queue
+
+        queue = asyncio.run(run())
+        assert seen == ["v1", "v2"]
+        assert queue.counters["rerun"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,174 @@
+"""Bounded priority work queue with a fixed worker pool and retries"""
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class QueueFull(Exception):
+    """Raised on submit when the queue is at capacity (callers should back off)"""
+
+
+class JobState:
+    def __init__(self, key: str, payload: Any, priority: int):
+        self.key = key
+        self.payload = payload
+        self.priority = priority
+        self.status = "queued"  # queued, running, retrying, done, failed
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.next_payload: Any = None  # set when resubmitted with new input while running
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "dirty": self.next_payload is not None,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class WorkQueue:
+    """Lower priority numbers run first; equal priorities run in submit order.
+
+    A job that raises is retried with exponential backoff up to max_attempts.
+    Retries re-enter the queue even when it is full, so accepted work is
+    never dropped; only new submissions see backpressure. Resubmitting an
+    active key with replace=True swaps in the new payload; a running job is
+    marked dirty and runs again with it once the current attempt ends.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, Any, int], Awaitable[Any]],
+        workers: int = 2,
+        maxsize: int = 100,
+        max_attempts: int = 3,
+        backoff: float = 2.0,
+        keep_finished: int = 500,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.keep_finished = keep_finished
+        self.jobs: Dict[str, JobState] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks = []
+        self._retry_timers = set()
+        self._sequence = itertools.count()
+        self.running = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "retried": 0, "rerun": 0, "rejected_full": 0}
+
+    async def start(self):
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        tasks = self._tasks + list(self._retry_timers)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retry_timers.clear()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, key: str, payload: Any, priority: int = 5, replace: bool = False) -> JobState:
+        existing = self.jobs.get(key)
+        if existing and existing.status in ("queued", "running", "retrying"):
+            if replace:
+                if existing.status == "running":
+                    existing.next_payload = payload
+                else:
+                    existing.payload, existing.attempts = payload, 0
+            return existing
+        if self._queue is None:
+            raise RuntimeError("Work queue not started")
+        if self.depth >= self.maxsize:
+            self.counters["rejected_full"] += 1
+            raise QueueFull(key)
+
+        job = JobState(key, payload, priority)
+        self.jobs[key] = job
+        self._queue.put_nowait((priority, next(self._sequence), job))
+        self.counters["submitted"] += 1
+        self._trim()
+        return job
+
+    def _trim(self):
+        finished = [k for k, j in self.jobs.items() if j.status in ("done", "failed")]
+        for key in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[key]
+
+    async def _requeue_later(self, job: JobState, delay: float):
+        await asyncio.sleep(delay)
+        self._requeue(job)
+
+    def _requeue(self, job: JobState):
+        job.status = "queued"
+        self._queue.put_nowait((job.priority, next(self._sequence), job))
+
+    def _schedule_retry(self, job: JobState, delay: float):
+        timer = asyncio.create_task(self._requeue_later(job, delay))
+        self._retry_timers.add(timer)
+        timer.add_done_callback(self._retry_timers.discard)
+
+    async def _worker(self):
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = "running"
+            job.attempts += 1
+            self.running += 1
+            try:
+                job.result = await self.handler(job.key, job.payload, job.attempts)
+                job.status, job.error = "done", None
+                job.finished_at = time.time()
+                self.counters["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = str(e)
+                if job.next_payload is not None:
+                    # Rerun below with the new input instead of retrying the stale one
+                    job.status = "queued"
+                elif job.attempts < self.max_attempts:
+                    job.status = "retrying"
+                    self.counters["retried"] += 1
+                    self._schedule_retry(job, self.backoff ** job.attempts)
+                else:
+                    job.status = "failed"
+                    job.finished_at = time.time()
+                    self.counters["failed"] += 1
+            finally:
+                self.running -= 1
+                self._queue.task_done()
+            if job.next_payload is not None:
+                # Resubmitted while running: its result is stale, run again with the new input
+                job.payload, job.next_payload = job.next_payload, None
+                job.attempts, job.finished_at = 0, None
+                self.counters["rerun"] += 1
+                self._requeue(job)
+
+    def snapshot(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for job in self.jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "depth": self.depth,
+            "capacity": self.maxsize,
+            "workers": self.workers,
+            "running": self.running,
+            "jobs_by_status": by_status,
+            **self.counters,
+        }
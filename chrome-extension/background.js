@@ -1,6 +1,17 @@
 // JobFill AI - Background Service Worker
 const API_BASE = 'https://formzap-1.preview.emergentagent.com';
 
+// Stable random id for this install; the server rate-limits AI calls per install and address
+function getInstallId() {
+  return new Promise(resolve => {
+    chrome.storage.local.get(['installId'], (result) => {
+      if (result.installId) return resolve(result.installId);
+      const installId = crypto.randomUUID();
+      chrome.storage.local.set({ installId }, () => resolve(installId));
+    });
+  });
+}
+
 // Initialize extension
 chrome.runtime.onInstalled.addListener(() => {
   console.log('JobFill AI Extension installed');
@@ -29,6 +40,36 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
     return true; // Keep message channel open for async response
   }
   
+  if (request.action === 'getBootstrap') {
+    // Profile, settings, stats and recent applications in a single request;
+    // request.sections (e.g. 'profile,settings') limits what the server reads
+    const query = request.sections ? `?sections=${encodeURIComponent(request.sections)}` : '';
+    fetch(`${API_BASE}/api/bootstrap${query}`)
+      .then(r => r.json())
+      .then(data => {
+        chrome.storage.local.set({ bootstrap: data, bootstrapFetchedAt: Date.now() });
+        sendResponse({ success: true, ...data });
+      })
+      .catch(e => sendResponse({ success: false, error: e.message }));
+    return true;
+  }
+  
+  if (request.action === 'getFillPlan') {
+    // Revalidate the cached plan with its hash; a 304 costs no payload
+    chrome.storage.local.get(['fillPlan'], (result) => {
+      const cached = result.fillPlan;
+      const headers = cached ? { 'If-None-Match': `"${cached.version_hash}"` } : {};
+      fetch(`${API_BASE}/api/profile/fill-plan`, { headers })
+        .then(r => (r.status === 304 ? cached : r.json()))
+        .then(data => {
+          if (data !== cached) chrome.storage.local.set({ fillPlan: data });
+          sendResponse({ success: true, plan: data.plan });
+        })
+        .catch(e => sendResponse(cached ? { success: true, plan: cached.plan } : { success: false, error: e.message }));
+    });
+    return true;
+  }
+  
   if (request.action === 'getSettings') {
     chrome.storage.local.get(['settings'], (result) => {
       sendResponse({ success: true, settings: result.settings });
@@ -44,19 +85,36 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
   }
   
   if (request.action === 'analyzeForm') {
-    fetch(`${API_BASE}/api/ai/analyze-form`, {
+    // The page URL lets the server reuse an analysis pre-generated by saveJob
+    const data = { job_url: sender.tab?.url, ...request.data };
+    getInstallId()
+      .then(installId => fetch(`${API_BASE}/api/ai/analyze-form`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-Client-Id': installId },
+        body: JSON.stringify(data)
+      }))
+      .then(r => r.json())
+      .then(data => sendResponse({ success: true, mappings: data }))
+      .catch(e => sendResponse({ success: false, error: e.message }));
+    return true;
+  }
+  
+  if (request.action === 'saveJob') {
+    // Queue AI pre-generation so results are ready when the form is opened
+    fetch(`${API_BASE}/api/jobs/saved`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(request.data)
     })
       .then(r => r.json())
-      .then(data => sendResponse({ success: true, mappings: data }))
+      .then(data => sendResponse({ success: !!data.success, ...data }))
       .catch(e => sendResponse({ success: false, error: e.message }));
     return true;
   }
   
   if (request.action === 'logApplication') {
-    fetch(`${API_BASE}/api/applications`, {
+    // Skip if this job was already logged (e.g. by hand from the dashboard)
+    fetch(`${API_BASE}/api/applications?on_duplicate=skip`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(request.data)
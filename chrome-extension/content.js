@@ -4,6 +4,7 @@
   
   let profile = null;
   let settings = null;
+  let fillPlan = null; // Precomputed values from /api/profile/fill-plan
   let isProcessing = false;
   let fillCount = 0;
   
@@ -854,6 +855,8 @@
     currentTitle: /current[_\-\s]?title|job[_\-\s]?title|position|role|most[_\-\s]?recent[_\-\s]?title|designation|occupation/i,
     yearsExperience: /years?[_\-\s]?(of)?[_\-\s]?experience|experience[_\-\s]?years?|yoe|total[_\-\s]?experience/i,
     salary: /salary|compensation|pay|expected[_\-\s]?salary|desired[_\-\s]?salary|current[_\-\s]?salary|ctc|package/i,
+    jobStartDate: /(employment|job|work|position|role)[_\-\s]?(start|from)|date[_\-\s]?started/i,
+    jobEndDate: /(employment|job|work|position|role)[_\-\s]?(end|to\b)|date[_\-\s]?(left|ended)/i,
     startDate: /start[_\-\s]?date|available|availability|when[_\-\s]?can|join[_\-\s]?date|earliest/i,
     noticePeriod: /notice[_\-\s]?period|notice|serving[_\-\s]?notice/i,
     
@@ -893,6 +896,54 @@
   // VALUE GETTERS
   // =====================================================
   
+  // Pick the fill-plan phone variant the field's hints ask for
+  function planPhone(field, combined) {
+    const phone = fillPlan?.phone;
+    if (!phone) return null;
+    if (/country[_\-\s]?code|dial[_\-\s]?code|calling[_\-\s]?code/i.test(combined)) {
+      return phone.country_calling_code || '';
+    }
+    const hint = field.placeholder || '';
+    if (hint.trim().startsWith('+') || /e\.?164|international/i.test(combined)) return phone.e164 || phone.raw || '';
+    if (/\(\d{3}\)/.test(hint)) return phone.national || phone.raw || '';
+    if (/^\d{3}-\d{3}-\d{4}$/.test(hint.trim())) return phone.dashed || phone.national || '';
+    if (/^\d{3}\.\d{3}\.\d{4}$/.test(hint.trim())) return phone.dotted || phone.national || '';
+    if (field.maxLength > 0 && field.maxLength <= 10) return phone.national_digits || '';
+    return phone.raw || '';
+  }
+  
+  // Pick the fill-plan date variant (from date_formats) that suits the field
+  function planDate(formats, field) {
+    if (!formats) return '';
+    const hint = `${field.placeholder || ''} ${getFieldLabel(field)}`.toLowerCase();
+    if (field.type === 'month') return formats.iso || '';
+    if (field.type === 'date') return formats.iso ? `${formats.iso}-01` : '';
+    if (/mm\s*\/\s*yyyy/.test(hint)) return formats.mm_yyyy || formats.year || '';
+    if (/yyyy\s*-\s*mm/.test(hint)) return formats.iso || formats.year || '';
+    if (/^\s*yyyy\s*$/i.test(field.placeholder || '') || field.maxLength === 4 || /\byear\b/.test(hint)) return formats.year || '';
+    if (field.tagName === 'SELECT') return formats.month_year || formats.year || '';
+    return formats.mon_year || formats.year || formats.raw || '';
+  }
+  
+  function planState(field, pi) {
+    const address = fillPlan?.address;
+    const code = address?.state_code ?? pi.state;
+    const full = address?.state_full ?? pi.state_full;
+    if (field.tagName === 'SELECT' || (field.maxLength && field.maxLength > 3)) return full || code || '';
+    return code || '';
+  }
+  
+  function planCountry(field, pi) {
+    const address = fillPlan?.address;
+    if (!address) {
+      if (field.tagName === 'SELECT') return pi.country || 'United States';
+      return pi.country || pi.country_code || 'United States';
+    }
+    if (field.maxLength === 2) return address.country_code || '';
+    if (field.maxLength === 3) return address.country_alpha3 || address.country_code || '';
+    return address.country || address.country_code || 'United States';
+  }
+  
   function getFieldValue(field, fieldType = 'text') {
     const name = (field.name || field.id || '').toLowerCase();
     const placeholder = (field.placeholder || '').toLowerCase();
@@ -908,9 +959,10 @@
     // Check autocomplete attribute first (most reliable)
     if (autocomplete) {
       if (autocomplete.includes('given-name') || autocomplete === 'fname') {
-        return pi.full_name?.split(' ')[0] || '';
+        return fillPlan?.name?.first ?? (pi.full_name?.split(' ')[0] || '');
       }
       if (autocomplete.includes('family-name') || autocomplete === 'lname') {
+        if (fillPlan?.name) return fillPlan.name.last_full;
         const parts = pi.full_name?.split(' ') || [];
         return parts.slice(1).join(' ') || '';
       }
@@ -918,55 +970,57 @@
         return pi.full_name || '';
       }
       if (autocomplete.includes('email')) return pi.email || '';
-      if (autocomplete.includes('tel')) return pi.phone || '';
-      if (autocomplete.includes('street-address') || autocomplete.includes('address-line1')) return pi.street_address || '';
+      if (autocomplete.includes('tel-country-code')) return fillPlan?.phone?.country_calling_code || '';
+      if (autocomplete.includes('tel-national')) return fillPlan?.phone?.national_digits ?? (pi.phone || '');
+      if (autocomplete.includes('tel')) return planPhone(field, combined) ?? (pi.phone || '');
+      if (autocomplete.includes('street-address') || autocomplete.includes('address-line1')) return fillPlan?.address?.street ?? (pi.street_address || '');
       if (autocomplete.includes('address-line2')) return ''; // Usually empty
-      if (autocomplete.includes('address-level2') || autocomplete.includes('city')) return pi.city || '';
-      if (autocomplete.includes('address-level1') || autocomplete.includes('state')) {
-        return field.tagName === 'SELECT' || (field.maxLength && field.maxLength > 3) ? (pi.state_full || pi.state) : pi.state;
-      }
-      if (autocomplete.includes('postal-code')) return pi.zip_code || '';
-      if (autocomplete.includes('country')) return pi.country || 'United States';
+      if (autocomplete.includes('address-level2') || autocomplete.includes('city')) return fillPlan?.address?.city ?? (pi.city || '');
+      if (autocomplete.includes('address-level1') || autocomplete.includes('state')) return planState(field, pi);
+      if (autocomplete.includes('postal-code')) return fillPlan?.address?.zip ?? (pi.zip_code || '');
+      if (autocomplete.includes('country')) return planCountry(field, pi);
     }
     
     // Name fields
     if (fieldPatterns.fullName.test(combined)) return pi.full_name || '';
-    if (fieldPatterns.firstName.test(combined)) return pi.full_name?.split(' ')[0] || '';
+    if (fieldPatterns.firstName.test(combined)) return fillPlan?.name?.first ?? (pi.full_name?.split(' ')[0] || '');
     if (fieldPatterns.lastName.test(combined)) {
+      if (fillPlan?.name) return fillPlan.name.last_full;
       const parts = pi.full_name?.split(' ') || [];
       return parts.slice(1).join(' ') || '';
     }
-    if (fieldPatterns.middleName.test(combined)) return ''; // Usually empty
-    if (fieldPatterns.preferredName.test(combined)) return pi.full_name?.split(' ')[0] || '';
+    if (fieldPatterns.middleName.test(combined)) return fillPlan?.name?.middle || '';
+    if (fieldPatterns.preferredName.test(combined)) return fillPlan?.name?.preferred ?? (pi.full_name?.split(' ')[0] || '');
     
     // Contact
     if (fieldPatterns.email.test(combined)) return pi.email || '';
-    if (fieldPatterns.phone.test(combined)) return pi.phone || '';
+    if (fieldPatterns.phone.test(combined)) return planPhone(field, combined) ?? (pi.phone || '');
     if (fieldPatterns.linkedin.test(combined)) return pi.linkedin || '';
     if (fieldPatterns.github.test(combined)) return pi.github || '';
     if (fieldPatterns.twitter.test(combined)) return pi.twitter || '';
     if (fieldPatterns.website.test(combined)) return pi.website || pi.portfolio || '';
     
     // Address
-    if (fieldPatterns.streetAddress.test(combined)) return pi.street_address || '';
+    if (fieldPatterns.streetAddress.test(combined)) return fillPlan?.address?.street ?? (pi.street_address || '');
     if (fieldPatterns.addressLine2.test(combined)) return ''; // Apt included in street_address
-    if (fieldPatterns.city.test(combined)) return pi.city || '';
-    if (fieldPatterns.state.test(combined)) {
-      if (field.tagName === 'SELECT' || (field.maxLength && field.maxLength > 3)) {
-        return pi.state_full || pi.state || '';
-      }
-      return pi.state || '';
-    }
-    if (fieldPatterns.zipCode.test(combined)) return pi.zip_code || '';
-    if (fieldPatterns.country.test(combined)) {
-      if (field.tagName === 'SELECT') return pi.country || 'United States';
-      return pi.country || pi.country_code || 'United States';
-    }
+    if (fieldPatterns.city.test(combined)) return fillPlan?.address?.city ?? (pi.city || '');
+    if (fieldPatterns.state.test(combined)) return planState(field, pi);
+    if (fieldPatterns.zipCode.test(combined)) return fillPlan?.address?.zip ?? (pi.zip_code || '');
+    if (fieldPatterns.country.test(combined)) return planCountry(field, pi);
     if (fieldPatterns.location.test(combined)) {
+      if (fillPlan?.address) return fillPlan.address.city_state || fillPlan.address.location || '';
       return `${pi.city || ''}, ${pi.state || ''}`.trim().replace(/^,|,$/g, '') || pi.location || '';
     }
     
-    // Employment
+    // Employment (dates first: "position start date" would otherwise match currentTitle)
+    if (fieldPatterns.jobStartDate.test(combined)) {
+      return planDate(fillPlan?.experience?.[0]?.start, field) || profile.work_experience?.[0]?.start_date || '';
+    }
+    if (fieldPatterns.jobEndDate.test(combined)) {
+      const exp = profile.work_experience?.[0];
+      if (!exp || exp.current) return '';
+      return planDate(fillPlan?.experience?.[0]?.end, field) || exp.end_date || '';
+    }
     if (fieldPatterns.currentCompany.test(combined)) {
       const exp = profile.work_experience?.[0];
       return exp?.company || '';
@@ -975,11 +1029,14 @@
       const exp = profile.work_experience?.[0];
       return exp?.title || '';
     }
-    if (fieldPatterns.yearsExperience.test(combined)) return '4'; // Default
+    if (fieldPatterns.yearsExperience.test(combined)) return String(fillPlan?.years_experience ?? 4);
     if (fieldPatterns.startDate.test(combined)) return 'Immediately';
     if (fieldPatterns.noticePeriod.test(combined)) return '2 weeks';
     
     // Education
+    if (fieldPatterns.graduationYear.test(combined)) {
+      return planDate(fillPlan?.education?.[0]?.end, field) || profile.education?.[0]?.end_date || '';
+    }
     if (fieldPatterns.university.test(combined)) {
       const edu = profile.education?.[0];
       return edu?.institution || '';
@@ -1689,6 +1746,44 @@
     });
   }
   
+  // =====================================================
+  // JOB SAVING
+  // =====================================================
+  
+  // Field descriptions in the shape the backend's FormField expects
+  function describeFields() {
+    const { textFields, selectFields } = findAllFields();
+    return [...textFields, ...selectFields]
+      .filter(el => el.name || el.id)
+      .map(el => ({
+        field_name: el.name || el.id,
+        field_type: el.tagName === 'SELECT' ? 'select' : (el.tagName === 'TEXTAREA' ? 'textarea' : (el.type || 'text')),
+        field_id: el.id || null,
+        placeholder: el.placeholder || null,
+        label: getFieldLabel(el) || null,
+        options: el.tagName === 'SELECT' ? Array.from(el.options).map(o => o.text.trim()).filter(Boolean) : null
+      }));
+  }
+  
+  function saveJob() {
+    const longFormQuestions = findAllFields().textFields
+      .filter(el => el.tagName === 'TEXTAREA')
+      .map(el => getFieldLabel(el))
+      .filter(Boolean);
+    return new Promise(resolve => {
+      chrome.runtime.sendMessage({
+        action: 'saveJob',
+        data: {
+          job_url: window.location.href,
+          job_title: extractJobTitle() || 'Job Application',
+          company: extractCompanyName() || window.location.hostname,
+          fields: describeFields(),
+          long_form_questions: longFormQuestions
+        }
+      }, resolve);
+    });
+  }
+  
   function extractJobTitle() {
     const selectors = [
       'h1[class*="title"]', 'h1[class*="job"]', '.job-title', '[data-test*="title"]',
@@ -1787,7 +1882,7 @@
   function init() {
     console.log('JobFill AI: Initializing on', window.location.hostname);
     
-    chrome.runtime.sendMessage({ action: 'getProfile' }, (response) => {
+    chrome.runtime.sendMessage({ action: 'getBootstrap', sections: 'profile' }, (response) => {
       if (response?.success) profile = response.profile;
     });
     
@@ -1795,6 +1890,10 @@
       if (response?.success) settings = response.settings;
     });
     
+    chrome.runtime.sendMessage({ action: 'getFillPlan' }, (response) => {
+      if (response?.success) fillPlan = response.plan;
+    });
+    
     // Only show indicator on pages with forms
     if (document.querySelector('form, input, select, textarea')) {
       addIndicator();
@@ -1814,6 +1913,10 @@
       fillForm().then(result => sendResponse({ success: true, filled: result.filled }));
       return true;
     }
+    if (request.action === 'saveJob') {
+      saveJob().then(response => sendResponse(response || { success: false }));
+      return true;
+    }
     if (request.action === 'updateProfile') {
       profile = request.profile;
       sendResponse({ success: true });
@@ -3,6 +3,8 @@ document.addEventListener('DOMContentLoaded', () => {
   const fillBtn = document.getElementById('fillBtn');
   const fillBtnText = document.getElementById('fillBtnText');
   const dashboardBtn = document.getElementById('dashboardBtn');
+  const saveJobBtn = document.getElementById('saveJobBtn');
+  const saveJobBtnText = document.getElementById('saveJobBtnText');
   const enableToggle = document.getElementById('enableToggle');
   const stealthToggle = document.getElementById('stealthToggle');
   const statusDot = document.getElementById('statusDot');
@@ -74,6 +76,31 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   });
   
+  // Save job click: bookmark the posting so its answers are pre-generated
+  saveJobBtn.addEventListener('click', () => {
+    saveJobBtn.disabled = true;
+    saveJobBtnText.textContent = 'Saving...';
+    
+    chrome.tabs.query({ active: true, currentWindow: true }, (tabs) => {
+      if (!tabs[0]?.id) {
+        showResult('No active tab found', true);
+        resetSaveButton();
+        return;
+      }
+      
+      chrome.tabs.sendMessage(tabs[0].id, { action: 'saveJob' }, (response) => {
+        if (chrome.runtime.lastError) {
+          showResult('Extension not active on this page. Navigate to a job application.', true);
+        } else if (response?.success) {
+          showResult('✓ Job saved. Answers will be ready when you apply.', false);
+        } else {
+          showResult(response?.detail || 'Failed to save job', true);
+        }
+        resetSaveButton();
+      });
+    });
+  });
+  
   // Dashboard button click
   dashboardBtn.addEventListener('click', () => {
     chrome.tabs.create({ url: 'https://formzap-1.preview.emergentagent.com' });
@@ -142,6 +169,11 @@ document.addEventListener('DOMContentLoaded', () => {
     fillBtnText.textContent = 'Fill Application Now';
   }
   
+  function resetSaveButton() {
+    saveJobBtn.disabled = false;
+    saveJobBtnText.textContent = 'Save Job for Later';
+  }
+  
   // Reset daily stats at midnight
   const now = new Date();
   const lastReset = localStorage.getItem('lastStatsReset');
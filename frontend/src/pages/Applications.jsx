@@ -136,8 +136,7 @@ export default function Applications() {
 
   const updateStatus = async (id, newStatus) => {
     try {
-      const app = applications.find(a => a._id === id);
-      await axios.put(`${API_URL}/api/applications/${id}`, { ...app, status: newStatus });
+      await axios.post(`${API_URL}/api/applications/${id}/status`, { status: newStatus });
       setApplications(applications.map(a => 
         a._id === id ? { ...a, status: newStatus } : a
       ));
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { 
   Zap, 
@@ -107,44 +107,139 @@ export default function Dashboard() {
   });
   const [loading, setLoading] = useState(true);
   const [recentApps, setRecentApps] = useState(mockRecentApplications);
+  // Live events received while a bootstrap fetch is in flight; null once the snapshot is applied
+  const pendingEvents = useRef([]);
 
   useEffect(() => {
-    fetchStats();
-    fetchRecentApplications();
+    // Subscribe first so nothing logged while the snapshot loads is missed
+    const unsubscribe = subscribeToLiveUpdates();
+    fetchDashboard();
+    return unsubscribe;
   }, []);
 
-  const fetchStats = async () => {
+  // Application events with stats deltas; EventSource reconnects with Last-Event-ID on its own
+  const subscribeToLiveUpdates = () => {
+    if (typeof EventSource === 'undefined') {
+      return undefined;
+    }
+    const source = new EventSource(`${API_URL}/api/events/applications`);
+
+    ['application.created', 'application.updated', 'application.deleted'].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        const live = { id: event.lastEventId, type, data: JSON.parse(event.data) };
+        if (pendingEvents.current) {
+          pendingEvents.current.push(live);
+        } else {
+          applyLiveEvent(live);
+        }
+      });
+    });
+    // The server could not replay what we missed (restart, archival, too far behind)
+    source.addEventListener('resync', () => fetchDashboard());
+
+    return () => source.close();
+  };
+
+  const applyLiveEvent = ({ type, data }) => {
+    applyStatsDelta(data.delta);
+    if (type === 'application.created') {
+      setRecentApps(prev => [toRecentApp(data.application), ...prev.filter(app => app.id !== data.application._id)].slice(0, 5));
+    } else if (type === 'application.updated') {
+      setRecentApps(prev => prev.map(app => (app.id === data.id ? mergeRecentApp(app, data.application) : app)));
+    } else {
+      setRecentApps(prev => prev.filter(app => app.id !== data.id));
+    }
+  };
+
+  // Event ids are "<boot>-<seq>"; true when the event is already reflected in a snapshot taken at eventsAfter
+  const includedIn = (eventId, eventsAfter) => {
+    const [boot, seq] = (eventId || '').split('-');
+    const [snapshotBoot, snapshotSeq] = (eventsAfter || '').split('-');
+    return Boolean(eventsAfter) && boot === snapshotBoot && Number(seq) <= Number(snapshotSeq);
+  };
+
+  // One round trip for stats + recent applications; live events that arrive meanwhile are
+  // held and applied on top of the snapshot instead of being overwritten by it
+  const fetchDashboard = async () => {
+    pendingEvents.current = pendingEvents.current || [];
+    let eventsAfter = null;
     try {
-      const response = await axios.get(`${API_URL}/api/applications/stats`);
-      if (response.data) {
-        setStats(prev => ({
-          ...prev,
-          ...response.data,
-          interviews: response.data.status_breakdown?.Interview || 0
-        }));
+      const response = await axios.get(`${API_URL}/api/bootstrap?sections=stats,recent&recent_limit=5`);
+      eventsAfter = response.data?.events_after;
+      if (response.data?.stats) {
+        applyStats(response.data.stats);
+      }
+      if (response.data?.recent_applications?.length > 0) {
+        applyRecentApplications(response.data.recent_applications);
       }
     } catch (error) {
-      console.log('Using mock stats data');
+      console.log('Using mock dashboard data');
     } finally {
+      const buffered = pendingEvents.current;
+      pendingEvents.current = null;
+      buffered.filter(live => !includedIn(live.id, eventsAfter)).forEach(applyLiveEvent);
       setLoading(false);
     }
   };
 
-  const fetchRecentApplications = async () => {
-    try {
-      const response = await axios.get(`${API_URL}/api/applications?limit=5`);
-      if (response.data?.applications?.length > 0) {
-        setRecentApps(response.data.applications.map(app => ({
-          company: app.company,
-          position: app.position,
-          platform: app.platform,
-          status: app.status,
-          date: new Date(app.applied_date).toLocaleDateString()
-        })));
+  const applyStats = (data) => {
+    setStats(prev => ({
+      ...prev,
+      ...data,
+      interviews: data.status_breakdown?.Interview || 0
+    }));
+  };
+
+  const addCounts = (counts = {}, changes = {}) => {
+    const next = { ...counts };
+    Object.entries(changes).forEach(([key, change]) => {
+      next[key] = (next[key] || 0) + change;
+    });
+    return next;
+  };
+
+  const applyStatsDelta = (delta = {}) => {
+    setStats(prev => {
+      const next = {
+        ...prev,
+        total: (prev.total || 0) + (delta.total || 0),
+        weekly_applications: (prev.weekly_applications || 0) + (delta.weekly_applications || 0),
+        today_applications: (prev.today_applications || 0) + (delta.today_applications || 0),
+        status_breakdown: addCounts(prev.status_breakdown, delta.status_breakdown),
+        platform_breakdown: addCounts(prev.platform_breakdown, delta.platform_breakdown)
+      };
+      const successes = (next.status_breakdown.Interview || 0) + (next.status_breakdown.Offer || 0);
+      next.interviews = next.status_breakdown.Interview || 0;
+      next.success_rate = Math.round((successes / Math.max(next.total, 1)) * 1000) / 10;
+      return next;
+    });
+  };
+
+  const toRecentApp = (app) => ({
+    id: app._id,
+    company: app.company,
+    position: app.position,
+    platform: app.platform,
+    status: app.status,
+    date: new Date(app.applied_date).toLocaleDateString()
+  });
+
+  // Updates may carry only the changed fields (e.g. a status transition)
+  const mergeRecentApp = (app, changes = {}) => {
+    const merged = { ...app };
+    ['company', 'position', 'platform', 'status'].forEach((key) => {
+      if (changes[key] !== undefined) {
+        merged[key] = changes[key];
       }
-    } catch (error) {
-      console.log('Using mock applications data');
+    });
+    if (changes.applied_date) {
+      merged.date = new Date(changes.applied_date).toLocaleDateString();
     }
+    return merged;
+  };
+
+  const applyRecentApplications = (applications) => {
+    setRecentApps(applications.map(toRecentApp));
   };
 
   const statusData = Object.entries(stats.status_breakdown || {}).map(([name, value]) => ({
@@ -337,7 +432,7 @@ export default function Dashboard() {
             <div className="space-y-3">
               {recentApps.map((app, index) => (
                 <motion.div
-                  key={index}
+                  key={app.id || index}
                   initial={{ opacity: 0, x: -10 }}
                   animate={{ opacity: 1, x: 0 }}
                   transition={{ delay: index * 0.05 }}
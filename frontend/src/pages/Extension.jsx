@@ -664,10 +664,19 @@ export default function Extension() {
     setTimeout(() => setCopiedFile(null), 2000);
   };
 
-  const downloadExtension = () => {
-    // Download the actual zip file from the backend
+  const downloadExtension = async () => {
+    // Download the actual zip file from the backend; the content-hash URL is browser-cacheable
     const API_URL = process.env.REACT_APP_BACKEND_URL || '';
-    window.open(`${API_URL}/api/extension/download`, '_blank');
+    let downloadPath = '/api/extension/download';
+    try {
+      const info = await fetch(`${API_URL}/api/extension/info`);
+      if (info.ok) {
+        downloadPath = (await info.json()).download_url;
+      }
+    } catch (error) {
+      console.error('Error fetching extension info:', error);
+    }
+    window.open(`${API_URL}${downloadPath}`, '_blank');
     toast.success('Extension download started!');
   };
 
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { 
   User, 
@@ -213,8 +213,31 @@ const defaultProfile = {
   languages: ["English", "Hindi", "Telugu"]
 };
 
+// Server-managed keys that are never sent back in a patch
+const META_KEYS = ['_id', 'type', 'version', 'updated_at'];
+
+// Field-path operations for what changed since the last load/save
+const buildProfileOperations = (saved, current) => {
+  const operations = [];
+  Object.keys(current).forEach((key) => {
+    if (META_KEYS.includes(key)) return;
+    if (JSON.stringify(saved?.[key]) === JSON.stringify(current[key])) return;
+    if (key === 'personal_info' && saved?.personal_info) {
+      Object.keys(current.personal_info).forEach((field) => {
+        if (saved.personal_info[field] !== current.personal_info[field]) {
+          operations.push({ op: 'set', path: `personal_info.${field}`, value: current.personal_info[field] });
+        }
+      });
+    } else {
+      operations.push({ op: 'set', path: key, value: current[key] });
+    }
+  });
+  return operations;
+};
+
 export default function Profile() {
   const [profile, setProfile] = useState(defaultProfile);
+  const savedProfile = useRef(null);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
   const [editingSkill, setEditingSkill] = useState(false);
@@ -231,6 +254,7 @@ export default function Profile() {
       const response = await axios.get(`${API_URL}/api/profile`);
       if (response.data && response.data.personal_info) {
         setProfile(response.data);
+        savedProfile.current = response.data;
       }
     } catch (error) {
       console.log('Using default profile');
@@ -242,10 +266,24 @@ export default function Profile() {
   const saveProfile = async () => {
     setSaving(true);
     try {
-      await axios.put(`${API_URL}/api/profile`, profile);
+      const operations = buildProfileOperations(savedProfile.current, profile);
+      if (operations.length > 0) {
+        const response = await axios.patch(`${API_URL}/api/profile`, {
+          version: profile.version ?? 0,
+          operations
+        });
+        const saved = { ...profile, version: response.data.version };
+        setProfile(saved);
+        savedProfile.current = saved;
+      }
       toast.success('Profile saved successfully!');
     } catch (error) {
-      toast.error('Failed to save profile');
+      if (error.response?.status === 409) {
+        toast.error('Profile was changed elsewhere. Reloaded the latest version.');
+        fetchProfile();
+      } else {
+        toast.error('Failed to save profile');
+      }
       console.error(error);
     } finally {
       setSaving(false);
@@ -255,7 +293,7 @@ export default function Profile() {
   const resetProfile = async () => {
     try {
       await axios.post(`${API_URL}/api/profile/reset`);
-      setProfile(defaultProfile);
+      fetchProfile();
       toast.success('Profile reset to default');
     } catch (error) {
       setProfile(defaultProfile);